@@ -5,8 +5,22 @@ from app.config import get_settings
 
 settings = get_settings()
 
+if settings.DATABASE_URL.startswith("sqlite"):
+    # SQLite connections are opened in a worker thread but closed by get_db on
+    # the event loop thread, so allow cross-thread use there
+    engine_options = {"connect_args": {"check_same_thread": False}}
+else:
+    # The 5 + 10 default pool is far below the threadpool size (40) that sync
+    # endpoints run in; pre-ping drops connections the server has closed
+    engine_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
 # Create SQLAlchemy engine
-engine = create_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+engine = create_engine(settings.DATABASE_URL, echo=settings.DEBUG, **engine_options)
 
 # Create SessionLocal class
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -16,7 +30,20 @@ Base = declarative_base()
 
 
 # Dependency to get DB session
-def get_db():
+async def get_db():
+    """
+    Yield a DB session for one request.
+
+    Declared async so opening/closing the session runs on the event loop
+    instead of taking threadpool slots. With a sync generator, a burst of
+    requests can fill the threadpool with handlers waiting on a pooled
+    connection while the sessions holding those connections wait for a free
+    thread to close - the QueuePool deadlock. Handlers stay sync and still
+    run their queries in the threadpool.
+
+    Always use it via Depends(get_db): the session is closed (and its
+    connection returned to the pool) in the finally block.
+    """
     db = SessionLocal()
     try:
         yield db
@@ -1,19 +1,87 @@
-from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+import hashlib
+import threading
+import time
+from typing import Optional
+from cachetools import TTLCache
+from fastapi import Depends, HTTPException, Request, status
+from fastapi.security import HTTPBearer
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.config import get_settings
 from app.database import get_db
-from app.models import User
+from app.models import User, Role
 from app.utils.jwt import decode_token
 
-security = HTTPBearer()
+settings = get_settings()
+
+
+class BearerToken(HTTPBearer):
+    """
+    HTTPBearer that parses the Authorization header itself and returns the
+    raw token, skipping the HTTPAuthorizationCredentials model built per
+    request. Still registers the bearer scheme in the OpenAPI docs.
+    """
+
+    async def __call__(self, request: Request) -> str:
+        authorization = request.headers.get("Authorization", "")
+        scheme, _, token = authorization.partition(" ")
+        if not scheme or not token:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authenticated")
+        if scheme.lower() != "bearer":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Invalid authentication credentials"
+            )
+        return token
+
+
+security = BearerToken()
+
+# Resolved users keyed by SHA-256 of the bearer token.
+# TTL stays short (and never longer than an access token lives) so that
+# deactivations and role changes still take effect quickly.
+# Entries are plain column values, not ORM objects: each request gets its own
+# User built from them, so concurrent requests never share an instance.
+# get_current_user runs in the threadpool and TTLCache isn't thread-safe, so
+# every access goes through _user_cache_lock.
+_user_cache = TTLCache(maxsize=10000, ttl=min(30, settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60))
+_user_cache_lock = threading.Lock()
+
+
+def _column_values(obj) -> dict:
+    """Column attributes of a loaded ORM object as a plain dict"""
+    return {attr.key: getattr(obj, attr.key) for attr in inspect(obj).mapper.column_attrs}
+
+
+def _user_from_cache(user_values: dict, role_values: dict, perm_set: frozenset) -> User:
+    """Fresh (transient) User with its role, built from cached column values"""
+    user = User(**user_values)
+    user.role = Role(**role_values)
+    user._perm_set = perm_set
+    return user
+
+
+def invalidate_user_cache(user_id: int):
+    """Drop cached auth entries for a user (call after role/status changes)"""
+    with _user_cache_lock:
+        for key, (user_values, *_) in list(_user_cache.items()):
+            if user_values["id"] == user_id:
+                _user_cache.pop(key, None)
 
 
 def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
+    token: str = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
     """Get the current authenticated user from JWT token"""
-    token = credentials.credentials
+    # Check cache first
+    cache_key = hashlib.sha256(token.encode()).digest()
+    with _user_cache_lock:
+        cached = _user_cache.get(cache_key)
+    if cached is not None:
+        user_values, role_values, perm_set, expires_at = cached
+        if time.time() < expires_at:
+            return _user_from_cache(user_values, role_values, perm_set)
 
     # Decode token
     payload = decode_token(token)
@@ -41,7 +109,11 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.id == user_id).first()
+    # Load role + permissions in the same round trip so require_permission
+    # doesn't trigger lazy loads on every request
+    user = db.query(User).options(
+        joinedload(User.role).selectinload(Role.permissions)
+    ).filter(User.id == user_id).first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,35 +128,49 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Precompute permission names so require_permission is a set lookup
+    user._perm_set = frozenset(p.name for p in user.role.permissions)
+
+    with _user_cache_lock:
+        _user_cache[cache_key] = (
+            _column_values(user), _column_values(user.role), user._perm_set, payload["exp"]
+        )
+
     return user
 
 
-def require_permission(permission_name: str):
-    """Dependency to check if user has specific permission"""
-    def permission_checker(current_user: User = Depends(get_current_user)) -> User:
-        # Get user's role and permissions
-        user_permissions = [p.name for p in current_user.role.permissions]
+def authorize(permission: Optional[str] = None, role: Optional[str] = None):
+    """
+    Single dependency for permission and/or role checks.
 
-        if permission_name not in user_permissions:
+    Resolves the user once (cached token -> user with role and permissions
+    loaded in one query) and checks both conditions in the same call, so a
+    route needing a permission and a role doesn't stack separate checkers.
+    """
+    def checker(current_user: User = Depends(get_current_user)) -> User:
+        # Permission names are precomputed by get_current_user
+        if permission is not None and permission not in current_user._perm_set:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Permission denied: requires '{permission_name}'"
+                detail=f"Permission denied: requires '{permission}'"
             )
 
-        return current_user
-
-    return permission_checker
-
-
-def require_role(role_name: str):
-    """Dependency to check if user has specific role"""
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
-        if current_user.role.name != role_name:
+        if role is not None and current_user.role.name != role:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied: requires '{role_name}' role"
+                detail=f"Access denied: requires '{role}' role"
             )
 
         return current_user
 
-    return role_checker
+    return checker
+
+
+def require_permission(permission_name: str):
+    """Dependency to check if user has specific permission"""
+    return authorize(permission=permission_name)
+
+
+def require_role(role_name: str):
+    """Dependency to check if user has specific role"""
+    return authorize(role=role_name)
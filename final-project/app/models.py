@@ -1,7 +1,8 @@
-from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, ForeignKey, Table, Enum as SQLEnum
+from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, ForeignKey, Table, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
+from app.utils.distance import pack_weekly_hours
 import enum
 
 
@@ -45,6 +46,12 @@ role_permissions = Table(
 # Store Model
 class Store(Base):
     __tablename__ = "stores"
+    __table_args__ = (
+        # Radius search: status + bounding box in one index range scan
+        # (the only bounding-box query always filters on status too)
+        Index("ix_stores_status_lat_lon", "status", "latitude", "longitude"),
+        Index("ix_stores_postal_status", "address_postal_code", "status"),
+    )
 
     store_id = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -78,6 +85,14 @@ class Store(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    @property
+    def weekly_hours(self):
+        """Parsed (open_minute, close_minute) per weekday, Monday first"""
+        return pack_weekly_hours(
+            self.hours_mon, self.hours_tue, self.hours_wed, self.hours_thu,
+            self.hours_fri, self.hours_sat, self.hours_sun,
+        )
+
     # Note: services are stored in the store_services association table
     # We'll access them via a property or join
 
@@ -96,7 +111,7 @@ class User(Base):
     role_id = Column(Integer, ForeignKey('roles.id'))
 
     # Relationships
-    role = relationship("Role", back_populates="users")
+    role = relationship("Role", back_populates="users", lazy="joined")
     refresh_tokens = relationship("RefreshToken", back_populates="user", cascade="all, delete-orphan")
 
     # Timestamps
@@ -104,6 +119,10 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
 
+# Case-insensitive email lookups (login, user creation)
+Index("ix_users_email_lower", func.lower(User.email), unique=True)
+
+
 # Role Model
 class Role(Base):
     __tablename__ = "roles"
@@ -114,7 +133,7 @@ class Role(Base):
 
     # Relationships
     users = relationship("User", back_populates="role")
-    permissions = relationship("Permission", secondary=role_permissions, back_populates="roles")
+    permissions = relationship("Permission", secondary=role_permissions, back_populates="roles", lazy="selectin")
 
 
 # Permission Model
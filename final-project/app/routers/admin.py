@@ -1,4 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status, Request
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List
 import csv
@@ -7,7 +9,7 @@ from slowapi import Limiter
 from slowapi.util import get_remote_address
 from app.database import get_db
 from app.models import Store, store_services, User
-from app.dependencies import require_permission
+from app.dependencies import require_permission, invalidate_user_cache
 from app.schemas import BulkImportResponse, StoreImportResult, UserCreate, UserUpdate, UserResponse
 from app.utils.geocoding import geocode_address
 from app.utils.auth import get_password_hash
@@ -95,7 +97,8 @@ async def bulk_import_stores(
             if not latitude or not longitude:
                 # Attempt geocoding from address
                 full_address = f"{row['address_street']}, {row['address_city']}, {row['address_state']} {row['address_postal_code']}"
-                geocode_result = geocode_address(full_address)
+                # Geocoding is a blocking HTTP call - keep it off the event loop
+                geocode_result = await run_in_threadpool(geocode_address, full_address)
 
                 if geocode_result:
                     latitude = geocode_result['latitude']
@@ -254,7 +257,7 @@ def create_user(
     Requires admin permissions to create users with specific roles.
     """
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == user_data.email).first()
+    existing_user = db.query(User).filter(func.lower(User.email) == user_data.email.lower()).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -341,6 +344,7 @@ def update_user(
 
     db.commit()
     db.refresh(user)
+    invalidate_user_cache(user.id)
 
     return user
 
@@ -373,5 +377,6 @@ def deactivate_user(
     # Soft delete
     user.status = "inactive"
     db.commit()
+    invalidate_user_cache(user.id)
 
     return None
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from slowapi import Limiter
@@ -25,7 +26,7 @@ def login(request: Request, login_data: LoginRequest, db: Session = Depends(get_
     - Password: AdminTest123!
     """
     # Find user by email
-    user = db.query(User).filter(User.email == login_data.email).first()
+    user = db.query(User).filter(func.lower(User.email) == login_data.email.lower()).first()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
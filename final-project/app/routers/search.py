@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from sqlalchemy.orm import Session
 from typing import List
+from datetime import datetime
 import json
+import numpy as np
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from app.database import get_db
 from app.models import Store, store_services
 from app.schemas import StoreSearchRequest, StoreSearchResponse, StoreSearchResult, StoreResponse
 from app.utils.geocoding import geocode_address, geocode_postal_code
-from app.utils.distance import calculate_bounding_box, calculate_distance, is_store_open_now
+from app.utils.distance import calculate_bounding_box, haversine_miles, is_open_at
 from app.utils.cache import cache, SEARCH_TTL
 
 router = APIRouter(prefix="/api/stores", tags=["Store Search"])
@@ -117,15 +119,14 @@ def search_stores(request: Request, search_request: StoreSearchRequest, db: Sess
 
     stores = query.all()
 
-    # Step 4: Calculate exact distances and filter by radius
-    results = []
-    for store in stores:
-        # Calculate exact distance
-        distance = calculate_distance(
-            search_lat, search_lon,
-            store.latitude, store.longitude
-        )
+    # Step 4: Calculate exact distances (all candidates at once) and filter by radius
+    lats = np.fromiter((store.latitude for store in stores), dtype=np.float64, count=len(stores))
+    lons = np.fromiter((store.longitude for store in stores), dtype=np.float64, count=len(stores))
+    distances = haversine_miles(search_lat, search_lon, lats, lons).tolist()
 
+    now = datetime.now()
+    results = []
+    for store, distance in zip(stores, distances):
         # Filter by radius
         if distance > search_request.radius_miles:
             continue
@@ -141,17 +142,8 @@ def search_stores(request: Request, search_request: StoreSearchRequest, db: Sess
             if not all(service in services_list for service in search_request.services):
                 continue
 
-        # Check if open now
-        hours_dict = {
-            'hours_mon': store.hours_mon,
-            'hours_tue': store.hours_tue,
-            'hours_wed': store.hours_wed,
-            'hours_thu': store.hours_thu,
-            'hours_fri': store.hours_fri,
-            'hours_sat': store.hours_sat,
-            'hours_sun': store.hours_sun,
-        }
-        is_open = is_store_open_now(hours_dict)
+        # Check if open now (hours are parsed once per distinct schedule)
+        is_open = is_open_at(store.weekly_hours, now)
 
         # Filter by open_now
         if search_request.open_now and not is_open:
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from collections import defaultdict
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
 from app.models import Store, store_services, User
 from app.schemas import StoreResponse, StoreCreate, StoreUpdate
@@ -11,26 +12,47 @@ router = APIRouter(prefix="/api/stores", tags=["Stores"])
 
 @router.get("/", response_model=List[StoreResponse])
 def get_all_stores(
+    response: Response,
+    after: Optional[str] = None,
     skip: int = 0,
     limit: int = 50,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_permission("read:stores"))
 ):
-    """Get all stores with pagination (requires authentication)"""
-    stores = db.query(Store).offset(skip).limit(limit).all()
+    """
+    Get all stores with pagination (requires authentication)
+
+    Stores are ordered by store_id. When a full page is returned, the
+    X-Next-Cursor header holds the last store_id - pass it back as `after`
+    to seek straight to the next page via the primary key index.
+    `skip` (OFFSET) still works but scans every skipped row.
+    """
+    query = db.query(Store).order_by(Store.store_id)
+    if after is not None:
+        query = query.filter(Store.store_id > after)
+    else:
+        query = query.offset(skip)
+    stores = query.limit(limit).all()
+
+    if stores and len(stores) == limit:
+        response.headers["X-Next-Cursor"] = stores[-1].store_id
+
+    # Fetch services for the whole page in one query
+    services_by_store = defaultdict(list)
+    if stores:
+        rows = db.execute(
+            store_services.select().where(
+                store_services.c.store_id.in_([store.store_id for store in stores])
+            )
+        ).fetchall()
+        for row in rows:
+            services_by_store[row.store_id].append(row.service_name)
 
-    # Fetch services for each store
-    result = []
+    # StoreResponse reads attributes directly (from_attributes)
     for store in stores:
-        store_dict = store.__dict__.copy()
-        # Get services from association table
-        services = db.execute(
-            store_services.select().where(store_services.c.store_id == store.store_id)
-        ).fetchall()
-        store_dict['services'] = [s.service_name for s in services]
-        result.append(store_dict)
+        store.services = services_by_store[store.store_id]
 
-    return result
+    return stores
 
 
 @router.get("/{store_id}", response_model=StoreResponse)
@@ -49,10 +71,9 @@ def get_store(
         store_services.select().where(store_services.c.store_id == store.store_id)
     ).fetchall()
 
-    store_dict = store.__dict__.copy()
-    store_dict['services'] = [s.service_name for s in services]
+    store.services = [s.service_name for s in services]
 
-    return store_dict
+    return store
 
 
 @router.post("/", response_model=StoreResponse, status_code=status.HTTP_201_CREATED)
@@ -77,22 +98,19 @@ def create_store(
     db.add(new_store)
     db.flush()
 
-    # Add services
-    for service in services_list:
+    # Add services (single multi-row insert)
+    if services_list:
         db.execute(
-            store_services.insert().values(
-                store_id=new_store.store_id,
-                service_name=service
-            )
+            store_services.insert(),
+            [{"store_id": new_store.store_id, "service_name": service} for service in services_list]
         )
 
     db.commit()
     db.refresh(new_store)
 
-    result = new_store.__dict__.copy()
-    result['services'] = services_list
+    new_store.services = services_list
 
-    return result
+    return new_store
 
 
 @router.patch("/{store_id}", response_model=StoreResponse)
@@ -118,13 +136,11 @@ def update_store(
         db.execute(
             store_services.delete().where(store_services.c.store_id == store_id)
         )
-        # Add new services
-        for service in services_list:
+        # Add new services (single multi-row insert)
+        if services_list:
             db.execute(
-                store_services.insert().values(
-                    store_id=store_id,
-                    service_name=service
-                )
+                store_services.insert(),
+                [{"store_id": store_id, "service_name": service} for service in services_list]
             )
 
     # Update store fields
@@ -141,10 +157,9 @@ def update_store(
         ).fetchall()
         services_list = [s.service_name for s in services]
 
-    result = store.__dict__.copy()
-    result['services'] = services_list
+    store.services = services_list
 
-    return result
+    return store
 
 
 @router.delete("/{store_id}", status_code=status.HTTP_204_NO_CONTENT)
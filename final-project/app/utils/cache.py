@@ -71,4 +71,5 @@ cache = SimpleCache()
 
 # Cache TTL constants (in seconds)
 GEOCODING_TTL = 30 * 24 * 60 * 60  # 30 days
+GEOCODING_FAILURE_TTL = 5 * 60  # 5 minutes (negative cache for failed lookups)
 SEARCH_TTL = 5 * 60  # 5 minutes
@@ -1,5 +1,13 @@
 import math
-from geopy.distance import geodesic
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+import numpy as np
+
+# Mean Earth radius
+EARTH_RADIUS_MILES = 3958.8
+
+DAY_NAMES = ('mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun')
 
 
 def calculate_bounding_box(latitude: float, longitude: float, radius_miles: float) -> dict:
@@ -31,7 +39,9 @@ def calculate_bounding_box(latitude: float, longitude: float, radius_miles: floa
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
-    Calculate distance between two points using Haversine formula (via geopy).
+    Calculate distance between two points using Haversine formula.
+
+    Scalar version for single pairs; use haversine_miles for many points.
 
     Args:
         lat1, lon1: First point coordinates
@@ -40,45 +50,102 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     Returns:
         Distance in miles
     """
-    point1 = (lat1, lon1)
-    point2 = (lat2, lon2)
-    return geodesic(point1, point2).miles
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + \
+        math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * math.asin(math.sqrt(a))
 
 
-def is_store_open_now(hours: dict) -> bool:
+def haversine_miles(lat1, lon1, lat2, lon2) -> np.ndarray:
     """
-    Check if a store is currently open based on hours.
+    Vectorized Haversine distance in miles.
+
+    Accepts scalars or NumPy arrays (broadcast against each other), so the
+    distance from a search point to every candidate store is one call.
 
     Args:
-        hours: Dictionary with keys like 'hours_mon', 'hours_tue', etc.
+        lat1, lon1: First point(s) coordinates
+        lat2, lon2: Second point(s) coordinates
 
     Returns:
-        True if store is open now, False otherwise
+        Array of distances in miles
     """
-    from datetime import datetime
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + \
+        np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
 
-    # Get current day and time
-    now = datetime.now()
-    day_names = ['mon', 'tue', 'wed', 'thu', 'fri', 'sat', 'sun']
-    current_day = day_names[now.weekday()]
-    current_time = now.time()
 
-    # Get today's hours
-    hours_key = f'hours_{current_day}'
-    today_hours = hours.get(hours_key, 'closed')
+@lru_cache(maxsize=1024)
+def parse_hours(hours: str) -> Optional[Tuple[int, int]]:
+    """
+    Parse an hours string into minute-of-day integers.
 
-    if today_hours == 'closed':
-        return False
+    There are only a handful of distinct hours strings across all stores,
+    so parsed results are cached.
+
+    Args:
+        hours: "HH:MM-HH:MM" or "closed"
+
+    Returns:
+        (open_minute, close_minute), or None if closed or malformed
+    """
+    if not hours or hours == 'closed':
+        return None
 
-    # Parse hours (format: "HH:MM-HH:MM")
     try:
-        open_time_str, close_time_str = today_hours.split('-')
+        open_time_str, close_time_str = hours.split('-')
         open_hour, open_min = map(int, open_time_str.split(':'))
         close_hour, close_min = map(int, close_time_str.split(':'))
+    except ValueError:
+        return None
+
+    return open_hour * 60 + open_min, close_hour * 60 + close_min
 
-        open_time = datetime.now().replace(hour=open_hour, minute=open_min, second=0, microsecond=0).time()
-        close_time = datetime.now().replace(hour=close_hour, minute=close_min, second=0, microsecond=0).time()
 
-        return open_time <= current_time <= close_time
-    except:
+@lru_cache(maxsize=1024)
+def pack_weekly_hours(*hours: str) -> Tuple[Optional[Tuple[int, int]], ...]:
+    """
+    Pack a store's seven hours strings (Monday first) into parsed windows.
+
+    Stores share a small number of weekly schedules, so the packed tuple
+    is cached on the raw strings.
+
+    Returns:
+        Tuple indexed by weekday of (open_minute, close_minute) or None
+    """
+    return tuple(parse_hours(day) for day in hours)
+
+
+def is_open_at(weekly_hours: Tuple[Optional[Tuple[int, int]], ...], now: datetime) -> bool:
+    """
+    Check packed weekly hours (see pack_weekly_hours) against a time.
+
+    Returns:
+        True if the window for now's weekday contains now
+    """
+    window = weekly_hours[now.weekday()]
+    if window is None:
         return False
+
+    current_minute = now.hour * 60 + now.minute
+    return window[0] <= current_minute <= window[1]
+
+
+def is_store_open_now(hours: dict, now: Optional[datetime] = None) -> bool:
+    """
+    Check if a store is currently open based on hours.
+
+    Args:
+        hours: Dictionary with keys like 'hours_mon', 'hours_tue', etc.
+        now: Time to check (default: current local time). Pass the same
+            value when checking many stores in one request.
+
+    Returns:
+        True if store is open now, False otherwise
+    """
+    if now is None:
+        now = datetime.now()
+
+    weekly_hours = pack_weekly_hours(*(hours.get(f'hours_{day}', 'closed') for day in DAY_NAMES))
+    return is_open_at(weekly_hours, now)
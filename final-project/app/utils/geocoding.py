@@ -1,18 +1,68 @@
+import logging
+from functools import lru_cache
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 from app.config import get_settings
-from app.utils.cache import cache, GEOCODING_TTL
+from app.utils.cache import cache, GEOCODING_TTL, GEOCODING_FAILURE_TTL
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
-# Initialize geocoder
-geolocator = Nominatim(user_agent=settings.GEOCODING_USER_AGENT)
+# Cached in place of a result when the geocoding service fails
+_FAILED = {"__neg__": True}
+
+
+@lru_cache()
+def _geolocator() -> Nominatim:
+    """Geocoder client, built on first use rather than at import"""
+    return Nominatim(user_agent=settings.GEOCODING_USER_AGENT)
+
+
+class _GeocodeMiss(Exception):
+    """Raised for lookups without a result so lru_cache doesn't memoize them"""
+
+
+@lru_cache(maxsize=4096)
+def _geocode_cached(address: str) -> dict:
+    """
+    Two-tier lookup: lru_cache is the process-local L1 in front of the
+    shared cache (L2) and Nominatim. Only successful results are kept in L1.
+    """
+    # Check shared cache first
+    cache_key = f"geocode:address:{address}"
+    cached_result = cache.get(cache_key)
+    if cached_result is not None:
+        if cached_result.get("__neg__"):
+            raise _GeocodeMiss()
+        return cached_result
+
+    # Cache miss - call geocoding API
+    try:
+        location = _geolocator().geocode(address, timeout=10)
+    except (GeocoderTimedOut, GeocoderServiceError) as e:
+        logger.warning("geocode failed: %s", e, extra={"address": address})
+        cache.set(cache_key, _FAILED, GEOCODING_FAILURE_TTL)
+        raise _GeocodeMiss() from e
+
+    if not location:
+        raise _GeocodeMiss()
+
+    result = {
+        "latitude": location.latitude,
+        "longitude": location.longitude,
+        "formatted_address": location.address
+    }
+    # Cache the result for 30 days
+    cache.set(cache_key, result, GEOCODING_TTL)
+    return result
 
 
 def geocode_address(address: str) -> dict:
     """
     Convert an address to coordinates using Nominatim (free geocoding service).
-    Results are cached for 30 days to reduce API calls.
+    Results are cached in-process and in the shared cache for 30 days to
+    reduce API calls. Service failures are cached for 5 minutes so a bad
+    address doesn't hit the 10s timeout on every call.
 
     Args:
         address: Full address string
@@ -20,27 +70,9 @@ def geocode_address(address: str) -> dict:
     Returns:
         dict with 'latitude' and 'longitude', or None if geocoding fails
     """
-    # Check cache first
-    cache_key = f"geocode:address:{address.lower()}"
-    cached_result = cache.get(cache_key)
-    if cached_result is not None:
-        return cached_result
-
-    # Cache miss - call geocoding API
     try:
-        location = geolocator.geocode(address, timeout=10)
-        if location:
-            result = {
-                "latitude": location.latitude,
-                "longitude": location.longitude,
-                "formatted_address": location.address
-            }
-            # Cache the result for 30 days
-            cache.set(cache_key, result, GEOCODING_TTL)
-            return result
-        return None
-    except (GeocoderTimedOut, GeocoderServiceError) as e:
-        print(f"Geocoding error: {e}")
+        return _geocode_cached(address.lower())
+    except _GeocodeMiss:
         return None
 
 
@@ -1,35 +1,64 @@
 """
 Test configuration and fixtures
 """
+import csv
+import io
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.main import app
 from app.database import Base, get_db
 from app.models import User, Role, Permission, Store, store_services
 from app.utils.auth import get_password_hash
+from app.dependencies import _user_cache
 
 # Test database URL (using SQLite for testing)
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
 
 engine = create_engine(
     SQLALCHEMY_TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database for each test"""
+# pysqlite's own transaction handling breaks SAVEPOINT - let SQLAlchemy emit BEGIN
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+@pytest.fixture(scope="session")
+def tables():
+    """Create all tables once per test session"""
     Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session(tables):
+    """
+    Session wrapped in a transaction that is rolled back after each test.
+    Commits inside the test (and the app) only release a SAVEPOINT.
+    """
+    connection = engine.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
 @pytest.fixture(scope="function")
@@ -42,6 +71,7 @@ def client(db_session):
             pass
 
     app.dependency_overrides[get_db] = override_get_db
+    _user_cache.clear()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
@@ -56,11 +86,8 @@ def test_roles(db_session):
         "write:stores": Permission(name="write:stores", description="Create and update stores"),
         "delete:stores": Permission(name="delete:stores", description="Deactivate stores"),
     }
-    for perm in perms.values():
-        db_session.add(perm)
-    db_session.flush()
 
-    # Create roles
+    # Create roles (permissions are saved through the relationship)
     admin_role = Role(name="admin", description="Full access")
     admin_role.permissions = list(perms.values())
 
@@ -70,9 +97,7 @@ def test_roles(db_session):
     viewer_role = Role(name="viewer", description="Read-only")
     viewer_role.permissions = [perms["read:stores"]]
 
-    db_session.add(admin_role)
-    db_session.add(marketer_role)
-    db_session.add(viewer_role)
+    db_session.add_all([admin_role, marketer_role, viewer_role])
     db_session.commit()
 
     return {
@@ -90,24 +115,23 @@ def test_users(db_session, test_roles):
             email="admin@test.com",
             hashed_password=get_password_hash("AdminTest123!"),
             full_name="Admin User",
-            role_id=test_roles["admin"].id
+            role=test_roles["admin"]
         ),
         "marketer": User(
             email="marketer@test.com",
             hashed_password=get_password_hash("MarketerTest123!"),
             full_name="Marketer User",
-            role_id=test_roles["marketer"].id
+            role=test_roles["marketer"]
         ),
         "viewer": User(
             email="viewer@test.com",
             hashed_password=get_password_hash("ViewerTest123!"),
             full_name="Viewer User",
-            role_id=test_roles["viewer"].id
+            role=test_roles["viewer"]
         )
     }
 
-    for user in users.values():
-        db_session.add(user)
+    db_session.add_all(users.values())
     db_session.commit()
 
     return users
@@ -141,17 +165,72 @@ def test_store(db_session):
     db_session.flush()
 
     # Add services
-    db_session.execute(
-        store_services.insert().values(store_id=store.store_id, service_name="pharmacy")
-    )
-    db_session.execute(
-        store_services.insert().values(store_id=store.store_id, service_name="pickup")
-    )
+    db_session.execute(store_services.insert(), [
+        {"store_id": store.store_id, "service_name": "pharmacy"},
+        {"store_id": store.store_id, "service_name": "pickup"},
+    ])
     db_session.commit()
 
     return store
 
 
+def _store_rows(n, start=1):
+    """Generate n store rows as plain dicts, ids starting at S{start:04d}"""
+    return [
+        {
+            "store_id": f"S{i:04d}",
+            "name": f"Store {i:04d}",
+            "store_type": "regular",
+            "status": "active",
+            "latitude": 40.7128 + (i % 100) * 0.001,
+            "longitude": -74.0060 - (i % 100) * 0.001,
+            "address_street": f"{i} Seed St",
+            "address_city": "New York",
+            "address_state": "NY",
+            "address_postal_code": "10001",
+            "address_country": "USA",
+            "hours_mon": "09:00-21:00",
+            "hours_tue": "09:00-21:00",
+            "hours_wed": "09:00-21:00",
+            "hours_thu": "09:00-21:00",
+            "hours_fri": "09:00-21:00",
+            "hours_sat": "10:00-20:00",
+            "hours_sun": "closed",
+        }
+        for i in range(start, start + n)
+    ]
+
+
+def _copy_stores(db, rows):
+    """PostgreSQL only: stream rows through COPY FROM STDIN in one round-trip"""
+    columns = list(rows[0])
+    buf = io.StringIO()
+    csv.DictWriter(buf, fieldnames=columns).writerows(rows)
+    buf.seek(0)
+    with db.connection().connection.cursor() as cur:
+        cur.copy_expert(f"COPY stores ({', '.join(columns)}) FROM STDIN WITH CSV", buf)
+
+
+@pytest.fixture(scope="function")
+def seed_stores(db_session):
+    """
+    Return a helper that inserts n generated stores for load/pagination tests.
+
+    Skips the ORM unit of work - bulk_insert_mappings (executemany), or COPY
+    on PostgreSQL - so seeding thousands of rows stays fast.
+    """
+    def seed(n, start=1):
+        rows = _store_rows(n, start)
+        if db_session.bind.dialect.name == "postgresql":
+            _copy_stores(db_session, rows)
+        else:
+            db_session.bulk_insert_mappings(Store, rows)
+        db_session.commit()
+        return rows
+
+    return seed
+
+
 @pytest.fixture(scope="function")
 def admin_token(client, test_users):
     """Get admin access token"""
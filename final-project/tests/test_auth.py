@@ -2,6 +2,11 @@
 API tests for authentication endpoints
 """
 import pytest
+from sqlalchemy import event
+from app.models import User, Role
+from app.routers.auth import limiter
+from app.dependencies import _user_cache, authorize, get_current_user, invalidate_user_cache
+from app.utils.jwt import create_access_token
 
 
 class TestAuthenticationEndpoints:
@@ -20,6 +25,21 @@ class TestAuthenticationEndpoints:
         assert "refresh_token" in data
         assert data["token_type"] == "bearer"
 
+    def test_login_email_is_case_insensitive(self, client, test_users):
+        """Test login matches the email on lower(email), as ix_users_email_lower indexes it"""
+        # Keep this extra login out of the 5/minute login budget the other tests share
+        limiter.reset()
+        try:
+            response = client.post("/api/auth/login", json={
+                "email": "ADMIN@Test.com",
+                "password": "AdminTest123!"
+            })
+        finally:
+            limiter.reset()
+
+        assert response.status_code == 200
+        assert "access_token" in response.json()
+
     def test_login_wrong_password(self, client, test_users):
         """Test login with wrong password"""
         response = client.post("/api/auth/login", json={
@@ -57,6 +77,15 @@ class TestAuthenticationEndpoints:
 
         assert response.status_code == 403  # FastAPI HTTPBearer returns 403
 
+    def test_get_current_user_wrong_scheme(self, client, admin_token):
+        """Test non-Bearer Authorization header is rejected"""
+        response = client.get(
+            "/api/auth/me",
+            headers={"Authorization": f"Basic {admin_token}"}
+        )
+
+        assert response.status_code == 403
+
     def test_get_current_user_invalid_token(self, client):
         """Test with invalid token"""
         response = client.get(
@@ -65,3 +94,62 @@ class TestAuthenticationEndpoints:
         )
 
         assert response.status_code == 401
+
+    def test_user_permissions_eager_loaded(self, db_session, test_users):
+        """Test get_current_user loads user, role and permissions up front (no lazy loads later)"""
+        _user_cache.clear()
+        db_session.expire_all()
+        token = create_access_token({"user_id": test_users["admin"].id})
+        selects = []
+
+        def count_selects(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT"):
+                selects.append(statement)
+
+        engine = db_session.get_bind().engine
+        event.listen(engine, "before_cursor_execute", count_selects)
+        try:
+            user = get_current_user(token, db_session)
+            # user (+ role joined) and the role's permissions
+            assert len(selects) <= 2
+
+            selects.clear()
+            assert authorize(permission="read:stores")(user) is user
+            assert user.role.name == "admin"
+            assert "read:stores" in [p.name for p in user.role.permissions]
+            assert selects == []
+        finally:
+            event.remove(engine, "before_cursor_execute", count_selects)
+            _user_cache.clear()
+
+    def test_current_user_cached_until_invalidated(self, client, db_session, admin_token):
+        """Test resolved user is cached between requests until invalidated"""
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = client.get("/api/auth/me", headers=headers)
+        assert response.status_code == 200
+        user_id = response.json()["id"]
+
+        # Deactivate behind the cache's back - cached user is still served
+        db_session.query(User).filter(User.id == user_id).update({"status": "inactive"})
+        db_session.commit()
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+        invalidate_user_cache(user_id)
+        response = client.get("/api/auth/me", headers=headers)
+        assert response.status_code == 401
+        assert response.json()["detail"] == "User account is inactive"
+
+    def test_cached_user_is_not_shared_between_requests(self, db_session, test_users):
+        """Test each cache hit gets its own User instance"""
+        _user_cache.clear()
+        token = create_access_token({"user_id": test_users["admin"].id})
+
+        first = get_current_user(token, db_session)
+        second = get_current_user(token, db_session)
+        third = get_current_user(token, db_session)
+
+        assert second is not third
+        assert second.id == third.id == first.id
+        assert second.role.name == "admin"
+        assert "read:stores" in second._perm_set
+        _user_cache.clear()
@@ -18,6 +18,7 @@ class TestStoreEndpoints:
         data = response.json()
         assert len(data) == 1
         assert data[0]["store_id"] == "S0001"
+        assert sorted(data[0]["services"]) == ["pharmacy", "pickup"]
 
     def test_get_all_stores_without_auth(self, client, test_store):
         """Test that getting stores requires authentication"""
@@ -25,6 +26,20 @@ class TestStoreEndpoints:
 
         assert response.status_code == 403
 
+    def test_get_all_stores_keyset_pagination(self, client, seed_stores, admin_token, test_store):
+        """Test paging through stores with the after cursor"""
+        seed_stores(2, start=2)
+        headers = {"Authorization": f"Bearer {admin_token}"}
+
+        response = client.get("/api/stores/?limit=2", headers=headers)
+        assert [s["store_id"] for s in response.json()] == ["S0001", "S0002"]
+        cursor = response.headers["X-Next-Cursor"]
+        assert cursor == "S0002"
+
+        response = client.get(f"/api/stores/?limit=2&after={cursor}", headers=headers)
+        assert [s["store_id"] for s in response.json()] == ["S0003"]
+        assert "X-Next-Cursor" not in response.headers
+
     def test_get_single_store(self, client, admin_token, test_store):
         """Test getting a single store"""
         response = client.get(
@@ -121,6 +136,19 @@ class TestStoreEndpoints:
         # Other fields should remain unchanged
         assert data["address_city"] == "New York"
 
+    def test_update_store_services(self, client, marketer_token, test_store):
+        """Test replacing a store's services"""
+        headers = {"Authorization": f"Bearer {marketer_token}"}
+        response = client.patch(
+            "/api/stores/S0001",
+            json={"services": ["optical", "returns", "pickup"]},
+            headers=headers
+        )
+        assert response.status_code == 200
+
+        response = client.get("/api/stores/S0001", headers=headers)
+        assert sorted(response.json()["services"]) == ["optical", "pickup", "returns"]
+
     def test_update_store_as_viewer_forbidden(self, client, viewer_token, test_store):
         """Test that viewer cannot update stores"""
         response = client.patch(
@@ -2,8 +2,14 @@
 Unit tests for utility functions
 """
 import pytest
-from app.utils.distance import calculate_bounding_box, calculate_distance, is_store_open_now
+import numpy as np
+from app.utils.distance import calculate_bounding_box, calculate_distance, haversine_miles, is_store_open_now, parse_hours, pack_weekly_hours, is_open_at
 from app.utils.auth import get_password_hash, verify_password
+from app.utils import geocoding
+from app.utils.cache import cache
+from app.config import get_settings
+from pydantic import ValidationError
+from geopy.exc import GeocoderTimedOut
 from datetime import datetime
 
 
@@ -38,6 +44,82 @@ class TestDistanceUtils:
         distance = calculate_distance(40.7128, -74.0060, 40.7128, -74.0060)
         assert distance < 0.01  # Essentially zero
 
+    def test_haversine_miles_matches_scalar(self):
+        """Test vectorized distances match the scalar calculation"""
+        lats = np.array([39.9526, 40.7580, 42.3601])
+        lons = np.array([-75.1652, -73.9855, -71.0589])
+
+        distances = haversine_miles(40.7128, -74.0060, lats, lons)
+
+        expected = [calculate_distance(40.7128, -74.0060, lat, lon) for lat, lon in zip(lats, lons)]
+        assert np.allclose(distances, expected)
+
+
+class TestStoreHoursUtils:
+    """Test store hours utilities"""
+
+    def test_parse_hours(self):
+        """Test hours strings parse to minute-of-day windows"""
+        assert parse_hours("09:00-21:30") == (540, 1290)
+        assert parse_hours("closed") is None
+        assert parse_hours("not hours") is None
+
+    def test_is_store_open_now(self):
+        """Test open check against a fixed time"""
+        hours = {"hours_mon": "09:00-21:00", "hours_sun": "closed"}
+        monday = datetime(2025, 11, 17)
+
+        assert is_store_open_now(hours, monday.replace(hour=12)) is True
+        assert is_store_open_now(hours, monday.replace(hour=22)) is False
+        assert is_store_open_now(hours, datetime(2025, 11, 16, 12)) is False  # Sunday
+        assert is_store_open_now(hours, datetime(2025, 11, 18, 12)) is False  # Tuesday missing
+
+    def test_pack_weekly_hours(self):
+        """Test packed weekly hours index by weekday"""
+        weekly = pack_weekly_hours("09:00-21:00", "closed", "closed", "closed", "closed", "closed", "10:00-18:00")
+
+        assert weekly[0] == (540, 1260)
+        assert weekly[1] is None
+        assert is_open_at(weekly, datetime(2025, 11, 16, 12)) is True  # Sunday
+        assert is_open_at(weekly, datetime(2025, 11, 18, 12)) is False  # Tuesday
+
+
+class TestGeocodingUtils:
+    """Test geocoding utilities"""
+
+    def test_geocode_failure_is_cached(self, monkeypatch):
+        """Test a failed lookup is not retried while negatively cached"""
+        calls = []
+
+        def failing_geocode(address, timeout):
+            calls.append(address)
+            raise GeocoderTimedOut("timed out")
+
+        monkeypatch.setattr(geocoding._geolocator(), "geocode", failing_geocode)
+        cache.clear()
+
+        assert geocoding.geocode_address("1 Nowhere Rd") is None
+        assert geocoding.geocode_address("1 Nowhere Rd") is None
+        assert len(calls) == 1
+        cache.clear()
+
+    def test_geocode_success_is_memoized(self, monkeypatch):
+        """Test a successful lookup is served in-process without the shared cache"""
+        class Location:
+            latitude = 40.7128
+            longitude = -74.0060
+            address = "New York, NY"
+
+        monkeypatch.setattr(geocoding._geolocator(), "geocode", lambda address, timeout: Location())
+        geocoding._geocode_cached.cache_clear()
+        cache.clear()
+
+        first = geocoding.geocode_address("1 Memo St, New York")
+        cache.clear()  # L1 still has it
+        assert geocoding.geocode_address("1 MEMO ST, New York") == first
+        assert geocoding._geocode_cached.cache_info().hits == 1
+        geocoding._geocode_cached.cache_clear()
+
 
 class TestAuthUtils:
     """Test authentication utilities"""
@@ -70,3 +152,15 @@ class TestAuthUtils:
         # But both should verify
         assert verify_password(password, hash1) is True
         assert verify_password(password, hash2) is True
+
+
+class TestSettings:
+    """Test application settings"""
+
+    def test_settings_are_shared_and_frozen(self):
+        """Test get_settings returns one immutable instance"""
+        settings = get_settings()
+        assert get_settings() is settings
+
+        with pytest.raises(ValidationError):
+            settings.DEBUG = not settings.DEBUG
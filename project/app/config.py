@@ -5,6 +5,13 @@ from functools import lru_cache
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    # Connection budget per process: sync pool (threadpool endpoints) plus the
+    # smaller async pool (async endpoints), (10 + 20) + (5 + 5) = 40 at most
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_ASYNC_POOL_SIZE: int = 5
+    DB_ASYNC_MAX_OVERFLOW: int = 5
+    DB_POOL_RECYCLE: int = 1800  # seconds
 
     # JWT
     SECRET_KEY: str
@@ -1,15 +1,74 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import get_settings
 
 settings = get_settings()
 
+
+def _engine_options(url: str, pool_size: int, max_overflow: int) -> dict:
+    """
+    Pool and driver options for an engine on url.
+
+    Server databases get a pool of pool_size + max_overflow connections,
+    pre-ping and recycle so dropped connections are replaced, and a larger
+    compiled-statement cache. The sync and async engines each have their own
+    pool, so their sizes together are the per-process connection count.
+    INSERT executemany already goes through insertmanyvalues; on psycopg2,
+    values_plus_batch also sends executemany UPDATE/DELETE (e.g.
+    bulk_update_mappings in CSV import) in pages.
+    """
+    url = make_url(url)
+    options = {"query_cache_size": 1200}
+    if url.get_backend_name() != "sqlite":
+        options.update(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_pre_ping=True,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    if url.get_driver_name() == "psycopg2":
+        options["executemany_mode"] = "values_plus_batch"
+    return options
+
+
 # Create SQLAlchemy engine
-engine = create_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+engine = create_engine(
+    settings.DATABASE_URL,
+    echo=settings.DEBUG,
+    **_engine_options(settings.DATABASE_URL, settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW),
+)
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False: objects stay loaded after commit, so responses built
+# from them don't reload every attribute
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+def _async_database_url(url: str) -> str:
+    """Same database through an async driver: asyncpg for PostgreSQL, aiosqlite for SQLite"""
+    for prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("postgres://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(prefix):
+            return async_prefix + url[len(prefix):]
+    return url
+
+
+# Async engine for endpoints that await the database instead of holding a
+# threadpool thread through the query
+_async_url = _async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(
+    _async_url,
+    echo=settings.DEBUG,
+    **_engine_options(_async_url, settings.DB_ASYNC_POOL_SIZE, settings.DB_ASYNC_MAX_OVERFLOW),
+)
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
@@ -22,3 +81,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dependency to get an async DB session (for async def endpoints)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,24 +1,39 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from app.config import get_settings
 from app.routers import stores, auth, search, admin
+from app.utils.rate_limit import limiter
 
 settings = get_settings()
 
-# Initialize rate limiter (disabled in testing mode)
-limiter = Limiter(key_func=get_remote_address, enabled=not settings.TESTING)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Process pool for bulk import validation, shut down with the app so its
+    # workers don't outlive a reload
+    app.state.validation_pool = admin.create_validation_pool()
+    try:
+        yield
+    finally:
+        app.state.validation_pool.shutdown()
+
 
 app = FastAPI(
     title="Store Locator API",
     description="A production-ready Store Locator API with search and management features",
     version="1.0.0",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    # orjson serializes the validated response models (e.g. large search
+    # result lists) much faster than stdlib json
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# Add rate limiter to app state
+# Add rate limiter to app state (shared with the routers, disabled in testing mode)
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, ForeignKey, Table, Enum as SQLEnum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Float, Integer, Boolean, DateTime, ForeignKey, Table, Index, Enum as SQLEnum
+from sqlalchemy.orm import relationship, reconstructor
 from sqlalchemy.sql import func
 from app.database import Base
+from app.utils.distance import pack_weekly_hours
 import enum
+import sys
 
 
 # Enums
@@ -24,7 +26,9 @@ class UserStatus(str, enum.Enum):
     inactive = "inactive"
 
 
-# Association table for store services (many-to-many)
+# Association table for store services (many-to-many).
+# The composite primary key is the (store_id, service_name) index that the
+# services lookups by store_id read from - no separate index needed.
 store_services = Table(
     'store_services',
     Base.metadata,
@@ -45,6 +49,13 @@ role_permissions = Table(
 # Store Model
 class Store(Base):
     __tablename__ = "stores"
+    __table_args__ = (
+        # Radius search filters on status plus the lat/lon bounding box
+        Index("ix_stores_status_lat_lon", "status", "latitude", "longitude"),
+    )
+    # Fetch created_at/updated_at with RETURNING on INSERT/UPDATE instead of
+    # a follow-up SELECT when they are read
+    __mapper_args__ = {"eager_defaults": True}
 
     store_id = Column(String, primary_key=True, index=True)
     name = Column(String, nullable=False)
@@ -78,6 +89,38 @@ class Store(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Relationships - read-only, services are written through store_services.
+    # lazy="raise": load with selectinload() instead of one query per store
+    services = relationship("StoreService", viewonly=True, lazy="raise")
+
+    HOURS_COLUMNS = ('hours_mon', 'hours_tue', 'hours_wed', 'hours_thu', 'hours_fri', 'hours_sat', 'hours_sun')
+
+    @reconstructor
+    def _intern_hours(self):
+        """
+        Hours strings repeat across thousands of stores ("closed", "09:00-21:00"),
+        so intern them on load: one shared object per distinct value, and the
+        open_windows cache lookup compares by identity.
+        """
+        # Write __dict__ directly so the instance isn't marked dirty
+        for key in self.HOURS_COLUMNS:
+            value = self.__dict__.get(key)
+            if isinstance(value, str):
+                self.__dict__[key] = sys.intern(value)
+
+    @property
+    def open_windows(self):
+        """Parsed (open_minute, close_minute) per weekday, Monday first"""
+        return pack_weekly_hours(
+            self.hours_mon, self.hours_tue, self.hours_wed, self.hours_thu,
+            self.hours_fri, self.hours_sat, self.hours_sun,
+        )
+
+
+# StoreService Model (mapped onto the store_services association table)
+class StoreService(Base):
+    __table__ = store_services
+
 
 # User Model
 class User(Base):
@@ -131,7 +174,7 @@ class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
 
     id = Column(Integer, primary_key=True, index=True)
-    token_hash = Column(String, unique=True, index=True, nullable=False)
+    token_hash = Column(String(64), unique=True, index=True, nullable=False)  # SHA-256 hex
     user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'))
     expires_at = Column(DateTime(timezone=True), nullable=False)
     revoked = Column(Boolean, default=False)
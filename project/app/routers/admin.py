@@ -1,23 +1,177 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from concurrent.futures import ProcessPoolExecutor
 from typing import List
+import asyncio
+import codecs
 import csv
-import io
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import multiprocessing
+import os
 from app.database import get_db
-from app.models import Store, store_services, User
+from app.utils.rate_limit import apply_rate_limit
+from app.models import Store, StoreType, store_services, User
 from app.dependencies import require_permission
-from app.schemas import BulkImportResponse, StoreImportResult, UserCreate, UserUpdate, UserResponse
+from app.schemas import BulkImportResponse, StoreCsvRow, StoreImportResult, UserCreate, UserUpdate, UserResponse
 from app.utils.geocoding import geocode_address
 from app.utils.auth import get_password_hash
+from app.utils.cache import cache
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
-limiter = Limiter(key_func=get_remote_address)
+
+# Max store_ids per IN (...) lookup during bulk import
+IMPORT_ID_CHUNK_SIZE = 1000
+# CSV rows parsed and written per batch during bulk import
+IMPORT_BATCH_SIZE = 5000
+# Concurrent geocoding lookups during bulk import. Cache hits run in parallel;
+# actual API calls are spaced to 1/second by geocoding._wait_for_rate_limit
+GEOCODE_CONCURRENCY = 10
+# Batches at least this large are validated across worker processes; below
+# it, pickling rows to the workers costs more than it saves
+PARALLEL_VALIDATION_MIN_ROWS = 5000
+# Worker processes (and chunks per large batch) for parallel validation
+VALIDATION_WORKERS = os.cpu_count() or 1
+
+
+def _decoded_lines(binary_file):
+    """Decode an uploaded file line by line, reporting bad bytes as a 400"""
+    try:
+        yield from codecs.iterdecode(binary_file, 'utf-8')
+    except UnicodeDecodeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Error reading file: {str(e)}"
+        )
+
+
+def _row_batches(csv_reader, size):
+    """Yield lists of (row_number, row) from a DictReader; row 1 is the header"""
+    batch = []
+    for item in enumerate(csv_reader, start=2):
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _csv_row_error(error: ValidationError) -> str:
+    """Readable failure reason for a CSV row that didn't validate"""
+    first = error.errors()[0]
+    field = first['loc'][0] if first['loc'] else None
+    if field in ('store_id', 'name'):
+        return 'Missing store_id or name'
+    if field in ('latitude', 'longitude'):
+        return 'Invalid latitude or longitude format'
+    if field == 'store_type':
+        return f'Invalid store_type. Must be one of: {", ".join(t.value for t in StoreType)}'
+    return f"{field}: {first['msg']}"
+
+
+def _validate_rows(rows):
+    """
+    Validate (row_number, row) pairs against StoreCsvRow.
+
+    Returns:
+        (parsed, failed): (row_number, StoreCsvRow) pairs and StoreImportResult failures
+    """
+    parsed, failed = [], []
+    for row_num, row in rows:
+        try:
+            parsed.append((row_num, StoreCsvRow.model_validate(row)))
+        except ValidationError as e:
+            failed.append(StoreImportResult(
+                row_number=row_num,
+                store_id=row.get('store_id') or 'UNKNOWN',
+                status='failed',
+                error=_csv_row_error(e)
+            ))
+    return parsed, failed
+
+
+def create_validation_pool() -> ProcessPoolExecutor:
+    """
+    Worker processes for import validation, owned by the app lifespan (see
+    app.main). Workers start on the first large batch. They come from a
+    forkserver rather than being forked from the threaded server process,
+    where a lock held by another thread would stay locked in the child.
+    """
+    return ProcessPoolExecutor(
+        max_workers=VALIDATION_WORKERS,
+        mp_context=multiprocessing.get_context("forkserver")
+    )
+
+
+async def _validate_batch(batch, pool: ProcessPoolExecutor):
+    """
+    Validate a batch of CSV rows. Pydantic validation is pure-Python CPU work,
+    so large batches are split across the pool's worker processes (around the
+    GIL) and awaited without blocking the event loop.
+    """
+    if len(batch) < PARALLEL_VALIDATION_MIN_ROWS:
+        return _validate_rows(batch)
+
+    size = -(-len(batch) // VALIDATION_WORKERS)
+    loop = asyncio.get_running_loop()
+    results = await asyncio.gather(*(
+        loop.run_in_executor(pool, _validate_rows, batch[i:i + size])
+        for i in range(0, len(batch), size)
+    ))
+
+    parsed, failed = [], []
+    for chunk_parsed, chunk_failed in results:
+        parsed.extend(chunk_parsed)
+        failed.extend(chunk_failed)
+    return parsed, failed
+
+
+async def _geocode_addresses(addresses: List[str]) -> dict:
+    """
+    Geocode addresses concurrently, at most GEOCODE_CONCURRENCY at a time
+    (requests to the provider itself are still rate limited to 1/second).
+    The blocking geocoder runs in the threadpool so the event loop stays free.
+
+    Returns:
+        dict mapping each address to its geocode result (None on failure)
+    """
+    semaphore = asyncio.Semaphore(GEOCODE_CONCURRENCY)
+
+    async def geocode_one(address):
+        async with semaphore:
+            return await run_in_threadpool(geocode_address, address)
+
+    results = await asyncio.gather(*(geocode_one(address) for address in addresses))
+    return dict(zip(addresses, results))
+
+
+def _write_import_batch(db: Session, to_create: dict, to_update: dict, services_by_store: dict):
+    """
+    Write one batch of imported stores with executemany (no per-object unit
+    of work), then replace their services: one DELETE per id chunk and a
+    single executemany INSERT.
+    """
+    if to_create:
+        db.bulk_insert_mappings(Store, list(to_create.values()))
+    if to_update:
+        db.bulk_update_mappings(Store, list(to_update.values()))
+
+    imported_ids = list(services_by_store)
+    for i in range(0, len(imported_ids), IMPORT_ID_CHUNK_SIZE):
+        chunk = imported_ids[i:i + IMPORT_ID_CHUNK_SIZE]
+        db.execute(store_services.delete().where(store_services.c.store_id.in_(chunk)))
+    services_to_insert = [
+        {"store_id": store_id, "service_name": service}
+        for store_id, services_list in services_by_store.items()
+        for service in services_list
+    ]
+    if services_to_insert:
+        db.execute(store_services.insert(), services_to_insert)
 
 
 @router.post("/stores/import", response_model=BulkImportResponse)
-@limiter.limit("5/hour")  # Strict limit for bulk operations
+@apply_rate_limit("5/hour")  # Strict limit for bulk operations
 async def bulk_import_stores(
     request: Request,
     file: UploadFile = File(...),
@@ -37,7 +191,12 @@ async def bulk_import_stores(
     Returns:
     - created: Number of new stores created
     - updated: Number of existing stores updated
-    - failed: List of rows that failed with error messages
+    - failed: Number of rows that failed
+    - failed_records: Rows that failed validation or geocoding, with error messages
+
+    Row data problems are reported per row in failed_records and the other
+    rows are still imported. A database error while writing is different: the
+    whole import is rolled back and a 500 is returned, nothing is saved.
     """
     # Validate file type
     if not file.filename.endswith('.csv'):
@@ -46,18 +205,9 @@ async def bulk_import_stores(
             detail="File must be a CSV file"
         )
 
-    # Read file content
-    try:
-        contents = await file.read()
-        csv_text = contents.decode('utf-8')
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Error reading file: {str(e)}"
-        )
-
-    # Parse CSV
-    csv_reader = csv.DictReader(io.StringIO(csv_text))
+    # Stream the upload: decode and parse line by line instead of holding the
+    # whole file in memory (as bytes and again as str)
+    csv_reader = csv.DictReader(_decoded_lines(file.file))
 
     # Validate CSV headers
     required_headers = {'store_id', 'name', 'store_type', 'address_street',
@@ -76,148 +226,77 @@ async def bulk_import_stores(
     updated_count = 0
     failed_records: List[StoreImportResult] = []
 
-    for row_num, row in enumerate(csv_reader, start=2):  # Start at 2 (header is row 1)
-        try:
-            # Validate required fields
-            if not row.get('store_id') or not row.get('name'):
-                failed_records.append(StoreImportResult(
-                    row_number=row_num,
-                    store_id=row.get('store_id', 'UNKNOWN'),
-                    status='failed',
-                    error='Missing store_id or name'
-                ))
-                continue
-
-            # Handle coordinates - geocode if missing
-            latitude = row.get('latitude')
-            longitude = row.get('longitude')
-
-            if not latitude or not longitude:
-                # Attempt geocoding from address
-                full_address = f"{row['address_street']}, {row['address_city']}, {row['address_state']} {row['address_postal_code']}"
-                geocode_result = geocode_address(full_address)
-
-                if geocode_result:
-                    latitude = geocode_result['latitude']
-                    longitude = geocode_result['longitude']
-                else:
+    # Rows are processed in batches of IMPORT_BATCH_SIZE as they are parsed
+    for batch in _row_batches(csv_reader, IMPORT_BATCH_SIZE):
+        # Look up existing stores in one query per chunk instead of one per row
+        # (chunked to stay under database bound-parameter limits). Stores written
+        # by earlier batches are already flushed, so they are found here too.
+        store_ids = list({row['store_id'] for _, row in batch if row.get('store_id')})
+        existing_ids = set()
+        for i in range(0, len(store_ids), IMPORT_ID_CHUNK_SIZE):
+            chunk = store_ids[i:i + IMPORT_ID_CHUNK_SIZE]
+            existing_ids.update(
+                store_id for (store_id,) in db.query(Store.store_id).filter(Store.store_id.in_(chunk))
+            )
+
+        # Validate and normalize every row of the batch (pydantic core);
+        # chunks stay in row order, so later duplicates still win below
+        parsed_rows, failed_rows = await _validate_batch(batch, request.app.state.validation_pool)
+        failed_records.extend(failed_rows)
+
+        # Geocode rows missing coordinates up front, concurrently
+        geocoded = await _geocode_addresses(list({
+            parsed.full_address for _, parsed in parsed_rows
+            if parsed.latitude is None or parsed.longitude is None
+        }))
+
+        # Keyed by store_id; a later row for the same store replaces earlier ones
+        to_create = {}
+        to_update = {}
+        services_by_store = {}
+
+        for row_num, parsed in parsed_rows:
+            store_data = parsed.model_dump(exclude={'services'})
+
+            # Handle coordinates - use the address geocoded for this batch
+            if parsed.latitude is None or parsed.longitude is None:
+                geocode_result = geocoded.get(parsed.full_address)
+                if not geocode_result:
                     failed_records.append(StoreImportResult(
                         row_number=row_num,
-                        store_id=row['store_id'],
+                        store_id=parsed.store_id,
                         status='failed',
                         error='Could not geocode address and no coordinates provided'
                     ))
                     continue
-
-            # Convert coordinates to float
-            try:
-                latitude = float(latitude)
-                longitude = float(longitude)
-            except ValueError:
-                failed_records.append(StoreImportResult(
-                    row_number=row_num,
-                    store_id=row['store_id'],
-                    status='failed',
-                    error='Invalid latitude or longitude format'
-                ))
-                continue
-
-            # Validate store_type
-            valid_types = ['regular', 'flagship', 'outlet', 'pop-up']
-            store_type = row.get('store_type', 'regular').lower()
-            if store_type not in valid_types:
-                failed_records.append(StoreImportResult(
-                    row_number=row_num,
-                    store_id=row['store_id'],
-                    status='failed',
-                    error=f'Invalid store_type. Must be one of: {", ".join(valid_types)}'
-                ))
-                continue
-
-            # Parse services
-            services_str = row.get('services', '')
-            services_list = [s.strip() for s in services_str.split('|') if s.strip()]
-
-            # Check if store exists (UPSERT logic)
-            existing_store = db.query(Store).filter(Store.store_id == row['store_id']).first()
-
-            if existing_store:
-                # UPDATE existing store
-                existing_store.name = row['name']
-                existing_store.store_type = store_type
-                existing_store.latitude = latitude
-                existing_store.longitude = longitude
-                existing_store.address_street = row['address_street']
-                existing_store.address_city = row['address_city']
-                existing_store.address_state = row['address_state']
-                existing_store.address_postal_code = row['address_postal_code']
-                existing_store.phone = row.get('phone', '')
-                existing_store.hours_mon = row.get('hours_monday', 'closed')
-                existing_store.hours_tue = row.get('hours_tuesday', 'closed')
-                existing_store.hours_wed = row.get('hours_wednesday', 'closed')
-                existing_store.hours_thu = row.get('hours_thursday', 'closed')
-                existing_store.hours_fri = row.get('hours_friday', 'closed')
-                existing_store.hours_sat = row.get('hours_saturday', 'closed')
-                existing_store.hours_sun = row.get('hours_sunday', 'closed')
-
-                # Update services - delete old ones and add new ones
-                db.execute(
-                    store_services.delete().where(store_services.c.store_id == row['store_id'])
-                )
-                for service in services_list:
-                    db.execute(
-                        store_services.insert().values(
-                            store_id=row['store_id'],
-                            service_name=service
-                        )
-                    )
-
+                store_data['latitude'] = geocode_result['latitude']
+                store_data['longitude'] = geocode_result['longitude']
+
+            # UPSERT logic - rows are written in bulk at the end of the batch.
+            # A store_id seen earlier in this file counts as an update.
+            store_id = parsed.store_id
+            if store_id in to_create:
+                to_create[store_id].update(store_data)
+                updated_count += 1
+            elif store_id in existing_ids:
+                to_update[store_id] = store_data
                 updated_count += 1
-
             else:
-                # CREATE new store
-                new_store = Store(
-                    store_id=row['store_id'],
-                    name=row['name'],
-                    store_type=store_type,
-                    status='active',
-                    latitude=latitude,
-                    longitude=longitude,
-                    address_street=row['address_street'],
-                    address_city=row['address_city'],
-                    address_state=row['address_state'],
-                    address_postal_code=row['address_postal_code'],
-                    phone=row.get('phone', ''),
-                    hours_mon=row.get('hours_monday', 'closed'),
-                    hours_tue=row.get('hours_tuesday', 'closed'),
-                    hours_wed=row.get('hours_wednesday', 'closed'),
-                    hours_thu=row.get('hours_thursday', 'closed'),
-                    hours_fri=row.get('hours_friday', 'closed'),
-                    hours_sat=row.get('hours_saturday', 'closed'),
-                    hours_sun=row.get('hours_sunday', 'closed')
-                )
-                db.add(new_store)
-                db.flush()
-
-                # Add services
-                for service in services_list:
-                    db.execute(
-                        store_services.insert().values(
-                            store_id=row['store_id'],
-                            service_name=service
-                        )
-                    )
-
+                to_create[store_id] = {**store_data, 'status': 'active'}
                 created_count += 1
 
+            # Services are replaced when the batch is written
+            services_by_store[store_id] = parsed.services
+
+        # Write the batch before reading the next one to bound memory
+        try:
+            _write_import_batch(db, to_create, to_update, services_by_store)
         except Exception as e:
-            failed_records.append(StoreImportResult(
-                row_number=row_num,
-                store_id=row.get('store_id', 'UNKNOWN'),
-                status='failed',
-                error=str(e)
-            ))
-            continue
+            db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Database error: {str(e)}"
+            )
 
     # Commit all changes
     try:
@@ -229,6 +308,12 @@ async def bulk_import_stores(
             detail=f"Database error: {str(e)}"
         )
 
+    # Imported stores change search results
+    cache.delete_by_prefix("search:")
+
+    # Validation and geocoding failures are collected in separate passes
+    failed_records.sort(key=lambda record: record.row_number)
+
     return BulkImportResponse(
         total_rows=created_count + updated_count + len(failed_records),
         created=created_count,
@@ -1,28 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from datetime import datetime, timedelta, timezone
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from functools import lru_cache
 from app.database import get_db
+from app.utils.rate_limit import apply_rate_limit
 from app.models import User, RefreshToken
 from app.schemas import LoginRequest, Token, RefreshRequest, UserResponse
-from app.utils.auth import verify_password
+from app.utils.auth import verify_password, get_password_hash
 from app.utils.jwt import create_access_token, create_refresh_token, decode_token, hash_token
 from app.dependencies import get_current_user
-from app.config import get_settings
 
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
-limiter = Limiter(key_func=get_remote_address)
-settings = get_settings()
 
 
-def apply_rate_limit(limit_string):
-    """Decorator that applies rate limiting only if not in testing mode"""
-    def decorator(func):
-        if settings.TESTING:
-            return func
-        return limiter.limit(limit_string)(func)
-    return decorator
+@lru_cache()
+def _dummy_password_hash() -> str:
+    """Hash checked when the email is unknown, so both failure paths cost one bcrypt"""
+    return get_password_hash("dummy-password-for-timing")
 
 
 @router.post("/login", response_model=Token)
@@ -35,9 +29,13 @@ def login(request: Request, login_data: LoginRequest, db: Session = Depends(get_
     - Email: admin@test.com
     - Password: AdminTest123!
     """
-    # Find user by email
-    user = db.query(User).filter(User.email == login_data.email).first()
+    # Find user by email. Sync endpoint: FastAPI runs it in the threadpool, so
+    # bcrypt below doesn't block the event loop and logins verify in parallel.
+    # role is joined in the same query - it's needed for the token claims
+    user = db.query(User).options(joinedload(User.role)).filter(User.email == login_data.email).first()
     if not user:
+        # Still run bcrypt so response time doesn't reveal which emails exist
+        verify_password(login_data.password, _dummy_password_hash())
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -101,7 +99,8 @@ def refresh_access_token(refresh_data: RefreshRequest, db: Session = Depends(get
 
     # Check if token exists in database and is not revoked
     token_hash = hash_token(refresh_data.refresh_token)
-    db_token = db.query(RefreshToken).filter(
+    # Unique index lookup; only expires_at is needed, so skip hydrating the row
+    db_token = db.query(RefreshToken.expires_at).filter(
         RefreshToken.token_hash == token_hash,
         RefreshToken.revoked == False
     ).first()
@@ -120,7 +119,7 @@ def refresh_access_token(refresh_data: RefreshRequest, db: Session = Depends(get
         )
 
     # Get user
-    user = db.query(User).filter(User.id == payload.get("user_id")).first()
+    user = db.query(User).options(joinedload(User.role)).filter(User.id == payload.get("user_id")).first()
     if not user or user.status != "active":
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -154,13 +153,13 @@ def logout(
     """
     # Revoke the refresh token
     token_hash = hash_token(refresh_data.refresh_token)
-    db_token = db.query(RefreshToken).filter(
-        token_hash == RefreshToken.token_hash,
-        current_user.id == RefreshToken.user_id
-    ).first()
+    # Single UPDATE via the token_hash index - no SELECT + load first
+    revoked = db.query(RefreshToken).filter(
+        RefreshToken.token_hash == token_hash,
+        RefreshToken.user_id == current_user.id
+    ).update({RefreshToken.revoked: True}, synchronize_session=False)
 
-    if db_token:
-        db_token.revoked = True
+    if revoked:
         db.commit()
 
     return {"message": "Successfully logged out"}
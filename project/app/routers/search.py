@@ -1,34 +1,43 @@
+from collections import defaultdict
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session, class_mapper
 from typing import List
+from datetime import datetime
 import json
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+import numpy as np
 from app.database import get_db
+from app.utils.rate_limit import apply_rate_limit
 from app.models import Store, store_services
 from app.schemas import StoreSearchRequest, StoreSearchResponse, StoreSearchResult, StoreResponse
 from app.utils.geocoding import geocode_address, geocode_postal_code
-from app.utils.distance import calculate_bounding_box, calculate_distance, is_store_open_now
+from app.utils.distance import calculate_bounding_box, haversine_miles, is_open_at
 from app.utils.cache import cache, SEARCH_TTL
-from app.config import get_settings
 
 router = APIRouter(prefix="/api/stores", tags=["Store Search"])
-limiter = Limiter(key_func=get_remote_address)
-settings = get_settings()
 
+# Max store_ids per IN (...) lookup when loading stores inside the radius
+SEARCH_ID_CHUNK_SIZE = 1000
 
-def apply_rate_limit(limit_string):
-    """Decorator that applies rate limiting only if not in testing mode"""
-    def decorator(func):
-        if settings.TESTING:
-            return func
-        return limiter.limit(limit_string)(func)
-    return decorator
+# Column attribute names of Store, resolved once at import
+STORE_COLUMNS = tuple(attr.key for attr in class_mapper(Store).column_attrs)
+
+# Services for a set of stores; built once, the id list binds per request
+_services_stmt = select(store_services.c.store_id, store_services.c.service_name).where(
+    store_services.c.store_id.in_(bindparam("ids", expanding=True))
+)
+
+
+def _search_cache_key(search_request: StoreSearchRequest) -> str:
+    """Cache key for a coordinate search - one builder for both read and write"""
+    return (
+        f"search:{search_request.latitude:.4f}:{search_request.longitude:.4f}:{search_request.radius_miles}"
+        f":{'|'.join(search_request.services_key)}:{'|'.join(search_request.store_types_key)}"
+    )
 
 
 @router.post("/search", response_model=StoreSearchResponse)
-@apply_rate_limit("10/minute")
-@apply_rate_limit("100/hour")
+@apply_rate_limit("10/minute;100/hour")
 def search_stores(request: Request, search_request: StoreSearchRequest, db: Session = Depends(get_db)):
     """
     Search for nearby stores by address, postal code, or coordinates.
@@ -44,13 +53,9 @@ def search_stores(request: Request, search_request: StoreSearchRequest, db: Sess
     """
 
     # Check cache first (only for coordinate-based searches, not open_now filters)
+    cache_key = None
     if search_request.latitude and search_request.longitude and not search_request.open_now:
-        cache_key = f"search:{search_request.latitude:.4f}:{search_request.longitude:.4f}:{search_request.radius_miles}"
-        if search_request.services:
-            cache_key += f":{','.join(sorted(search_request.services))}"
-        if search_request.store_types:
-            cache_key += f":{','.join(sorted([st.value for st in search_request.store_types]))}"
-
+        cache_key = _search_cache_key(search_request)
         cached_result = cache.get(cache_key)
         if cached_result is not None:
             print(f"  [DEBUG] Cache HIT for {cache_key}")
@@ -116,8 +121,9 @@ def search_stores(request: Request, search_request: StoreSearchRequest, db: Sess
     # Step 2: Calculate bounding box for efficient database query
     bbox = calculate_bounding_box(search_lat, search_lon, search_request.radius_miles)
 
-    # Step 3: Query database with bounding box filter
-    query = db.query(Store).filter(
+    # Step 3: Query database with bounding box filter - only the columns
+    # needed for the radius check, no ORM objects yet
+    query = db.query(Store.store_id, Store.latitude, Store.longitude).filter(
         Store.latitude.between(bbox["min_lat"], bbox["max_lat"]),
         Store.longitude.between(bbox["min_lon"], bbox["max_lon"]),
         Store.status == "active"  # Only active stores
@@ -127,50 +133,48 @@ def search_stores(request: Request, search_request: StoreSearchRequest, db: Sess
     if search_request.store_types:
         query = query.filter(Store.store_type.in_(search_request.store_types))
 
-    stores = query.all()
+    candidates = query.all()
+
+    # Step 4: Calculate exact distances (all candidates at once) and filter by radius
+    lats = np.fromiter((c.latitude for c in candidates), dtype=np.float64, count=len(candidates))
+    lons = np.fromiter((c.longitude for c in candidates), dtype=np.float64, count=len(candidates))
+    distances = haversine_miles(search_lat, search_lon, lats, lons)
+    distance_by_id = {
+        candidates[i].store_id: float(distances[i])
+        for i in np.flatnonzero(distances <= search_request.radius_miles).tolist()
+    }
 
-    # Step 4: Calculate exact distances and filter by radius
+    # Load full rows and services only for stores inside the radius
+    # (chunked to stay under database bound-parameter limits on large radii)
+    stores = []
+    services_by_store = defaultdict(list)
+    store_ids = list(distance_by_id)
+    for i in range(0, len(store_ids), SEARCH_ID_CHUNK_SIZE):
+        chunk = store_ids[i:i + SEARCH_ID_CHUNK_SIZE]
+        stores.extend(db.query(Store).filter(Store.store_id.in_(chunk)))
+        for store_id, service_name in db.execute(_services_stmt, {"ids": chunk}):
+            services_by_store[store_id].append(service_name)
+
+    now = datetime.now()
     results = []
     for store in stores:
-        # Calculate exact distance
-        distance = calculate_distance(
-            search_lat, search_lon,
-            store.latitude, store.longitude
-        )
-
-        # Filter by radius
-        if distance > search_request.radius_miles:
-            continue
-
-        # Get store services
-        services = db.execute(
-            store_services.select().where(store_services.c.store_id == store.store_id)
-        ).fetchall()
-        services_list = [s.service_name for s in services]
+        distance = distance_by_id[store.store_id]
+        services_list = services_by_store[store.store_id]
 
         # Filter by services (AND logic - store must have ALL requested services)
         if search_request.services:
             if not all(service in services_list for service in search_request.services):
                 continue
 
-        # Check if open now
-        hours_dict = {
-            'hours_mon': store.hours_mon,
-            'hours_tue': store.hours_tue,
-            'hours_wed': store.hours_wed,
-            'hours_thu': store.hours_thu,
-            'hours_fri': store.hours_fri,
-            'hours_sat': store.hours_sat,
-            'hours_sun': store.hours_sun,
-        }
-        is_open = is_store_open_now(hours_dict)
+        # Check if open now (hours are parsed once per distinct schedule)
+        is_open = is_open_at(store.open_windows, now)
 
         # Filter by open_now
         if search_request.open_now and not is_open:
             continue
 
-        # Build store data
-        store_dict = store.__dict__.copy()
+        # Build store data - mapped columns only (no _sa_instance_state)
+        store_dict = {key: getattr(store, key) for key in STORE_COLUMNS}
         store_dict['services'] = services_list
 
         results.append({
@@ -198,12 +202,7 @@ def search_stores(request: Request, search_request: StoreSearchRequest, db: Sess
     }
 
     # Cache the result (only for coordinate-based searches, not open_now)
-    if search_request.latitude and search_request.longitude and not search_request.open_now:
-        cache_key = f"search:{search_request.latitude:.4f}:{search_request.longitude:.4f}:{search_request.radius_miles}"
-        if search_request.services:
-            cache_key += f":{','.join(sorted(search_request.services))}"
-        if search_request.store_types:
-            cache_key += f":{','.join(sorted([st.value for st in search_request.store_types]))}"
+    if cache_key is not None:
         cache.set(cache_key, response, SEARCH_TTL)
 
     return response
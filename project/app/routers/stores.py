@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 from typing import List
-from app.database import get_db
-from app.models import Store, store_services, User
+from app.database import get_db, get_async_db
+from app.models import Store, StoreService, store_services, User
 from app.schemas import StoreResponse, StoreCreate, StoreUpdate
 from app.dependencies import get_current_user, require_permission
 from app.utils.geocoding import geocode_address
@@ -10,29 +13,46 @@ from app.utils.cache import cache
 
 router = APIRouter(prefix="/api/stores", tags=["Stores"])
 
+# Service statements built once at import and reused with bound parameters
+_insert_services_stmt = store_services.insert()
+_delete_services_stmt = store_services.delete().where(store_services.c.store_id == bindparam("sid"))
+
+
+def _set_loaded_services(store: Store, services_list: List[str]):
+    """Mark store.services as loaded with the services just written, no SELECT"""
+    set_committed_value(store, 'services', [
+        StoreService(store_id=store.store_id, service_name=service) for service in services_list
+    ])
+
+
+def _get_store_with_services(db: Session, store_id: str):
+    """Load one store with its services (two queries), or None"""
+    return (
+        db.query(Store)
+        .options(selectinload(Store.services))
+        .filter(Store.store_id == store_id)
+        .first()
+    )
+
 
 @router.get("/", response_model=List[StoreResponse])
-def get_all_stores(
+async def get_all_stores(
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(require_permission("read:stores"))
 ):
     """Get all stores with pagination (requires authentication)"""
-    stores = db.query(Store).offset(skip).limit(limit).all()
-
-    # Fetch services for each store
-    result = []
-    for store in stores:
-        store_dict = store.__dict__.copy()
-        # Get services from association table
-        services = db.execute(
-            store_services.select().where(store_services.c.store_id == store.store_id)
-        ).fetchall()
-        store_dict['services'] = [s.service_name for s in services]
-        result.append(store_dict)
-
-    return result
+    # Services for the whole page come back in one extra IN query;
+    # raiseload guards against any other relationship lazy-loading per row.
+    # StoreResponse reads the ORM objects directly (from_attributes)
+    result = await db.execute(
+        select(Store)
+        .options(selectinload(Store.services), raiseload("*"))
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.scalars().all()
 
 
 @router.get("/{store_id}", response_model=StoreResponse)
@@ -42,19 +62,11 @@ def get_store(
     current_user: User = Depends(require_permission("read:stores"))
 ):
     """Get a single store by ID (requires authentication)"""
-    store = db.query(Store).filter(Store.store_id == store_id).first()
+    store = _get_store_with_services(db, store_id)
     if not store:
         raise HTTPException(status_code=404, detail="Store not found")
 
-    # Get services
-    services = db.execute(
-        store_services.select().where(store_services.c.store_id == store.store_id)
-    ).fetchall()
-
-    store_dict = store.__dict__.copy()
-    store_dict['services'] = [s.service_name for s in services]
-
-    return store_dict
+    return store
 
 
 @router.post("/", response_model=StoreResponse, status_code=status.HTTP_201_CREATED)
@@ -64,8 +76,8 @@ def create_store(
     current_user: User = Depends(require_permission("write:stores"))
 ):
     """Create a new store (requires write:stores permission - Admin or Marketer only)"""
-    # Check if store_id already exists
-    existing = db.query(Store).filter(Store.store_id == store_data.store_id).first()
+    # Check if store_id already exists (primary key probe, no row hydrated)
+    existing = db.query(Store.store_id).filter(Store.store_id == store_data.store_id).scalar()
     if existing:
         raise HTTPException(status_code=400, detail="Store ID already exists")
 
@@ -77,7 +89,11 @@ def create_store(
     # Auto-geocode if coordinates are missing but address is present
     if (store_dict.get('latitude') is None or store_dict.get('longitude') is None) and \
        (store_dict.get('address_street') and store_dict.get('address_city') and store_dict.get('address_state')):
-        full_address = f"{store_dict['address_street']}, {store_dict['address_city']}, {store_dict['address_state']}"
+        # Same address format as CSV import, so both share one geocoding cache entry
+        full_address = (
+            f"{store_dict['address_street']}, {store_dict['address_city']}, "
+            f"{store_dict['address_state']} {store_dict['address_postal_code']}"
+        )
         geo = geocode_address(full_address)
         if geo:
             store_dict['latitude'] = geo['latitude']
@@ -91,30 +107,26 @@ def create_store(
     # For now, we rely on the user providing it or we could generate one. 
     # The current schema requires store_id. Let's assume user provides it (as per the JSON example).
 
-    # Create store
-    new_store = Store(**store_dict)
+    # Create store (updated_at set explicitly so the INSERT needn't fetch it back)
+    new_store = Store(**store_dict, updated_at=None)
     db.add(new_store)
     db.flush()
 
-    # Invalidate search cache
-    cache.clear() 
+    # Invalidate search results; geocoding entries stay valid
+    cache.delete_by_prefix("search:")
 
-    # Add services
-    for service in services_list:
-        db.execute(
-            store_services.insert().values(
-                store_id=new_store.store_id,
-                service_name=service
-            )
-        )
+    # Add services (single executemany)
+    if services_list:
+        db.execute(_insert_services_stmt, [
+            {"store_id": new_store.store_id, "service_name": service} for service in services_list
+        ])
 
     db.commit()
-    db.refresh(new_store)
-
-    result = new_store.__dict__.copy()
-    result['services'] = services_list
 
-    return result
+    # Sessions don't expire on commit and created_at came back with the
+    # INSERT (eager_defaults), so the response needs no further SELECT
+    _set_loaded_services(new_store, services_list)
+    return new_store
 
 
 @router.patch("/{store_id}", response_model=StoreResponse)
@@ -125,7 +137,7 @@ def update_store(
     current_user: User = Depends(require_permission("write:stores"))
 ):
     """Partially update a store (requires write:stores permission - Admin or Marketer only)"""
-    store = db.query(Store).filter(Store.store_id == store_id).first()
+    store = _get_store_with_services(db, store_id)
     if not store:
         raise HTTPException(status_code=404, detail="Store not found")
 
@@ -133,41 +145,25 @@ def update_store(
     update_data = store_data.model_dump(exclude_unset=True)
 
     # Handle services separately
-    services_list = None
     if 'services' in update_data:
         services_list = update_data.pop('services')
-        # Delete existing services
-        db.execute(
-            store_services.delete().where(store_services.c.store_id == store_id)
-        )
-        # Add new services
-        for service in services_list:
-            db.execute(
-                store_services.insert().values(
-                    store_id=store_id,
-                    service_name=service
-                )
-            )
+        # Replace existing services: one DELETE, one executemany INSERT
+        db.execute(_delete_services_stmt, {"sid": store_id})
+        if services_list:
+            db.execute(_insert_services_stmt, [
+                {"store_id": store_id, "service_name": service} for service in services_list
+            ])
+        _set_loaded_services(store, services_list)
 
     # Update store fields
     for field, value in update_data.items():
         setattr(store, field, value)
 
     db.commit()
-    cache.clear() # Invalidate cache on update
-    db.refresh(store)
-
-    # Get current services
-    if services_list is None:
-        services = db.execute(
-            store_services.select().where(store_services.c.store_id == store_id)
-        ).fetchall()
-        services_list = [s.service_name for s in services]
-
-    result = store.__dict__.copy()
-    result['services'] = services_list
+    cache.delete_by_prefix("search:")  # Invalidate search results on update
 
-    return result
+    # Still loaded after commit; updated_at came back with the UPDATE
+    return store
 
 
 @router.delete("/{store_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -185,6 +181,6 @@ def delete_store(
     # Soft delete
     store.status = "inactive"
     db.commit()
-    cache.clear() # Invalidate cache on delete
+    cache.delete_by_prefix("search:")  # Invalidate search results on delete
 
     return None
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field, model_validator
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field, field_validator, model_validator
+from typing import Optional, List, Tuple
 from datetime import datetime
 from app.models import StoreType, StoreStatus, UserStatus
 
@@ -53,6 +53,12 @@ class StoreResponse(StoreBase):
     class Config:
         from_attributes = True
 
+    @field_validator('services', mode='before')
+    @classmethod
+    def service_names(cls, v):
+        """Accept the Store.services relationship (StoreService rows) as names"""
+        return [getattr(s, 'service_name', s) for s in v]
+
 
 # User Schemas
 class UserBase(BaseModel):
@@ -117,6 +123,16 @@ class StoreSearchRequest(BaseModel):
     store_types: Optional[List[StoreType]] = None
     open_now: Optional[bool] = None
 
+    @property
+    def services_key(self) -> Tuple[str, ...]:
+        """Services filter in canonical (sorted) order"""
+        return tuple(sorted(self.services or ()))
+
+    @property
+    def store_types_key(self) -> Tuple[str, ...]:
+        """Store type filter as sorted plain strings"""
+        return tuple(sorted(st.value for st in self.store_types or ()))
+
     @model_validator(mode='after')
     def validate_lat_lon_pair(self):
         if (self.latitude is not None and self.longitude is None) or \
@@ -144,6 +160,52 @@ class StoreSearchResponse(BaseModel):
 
 
 # Bulk Import Schemas
+class StoreCsvRow(BaseModel):
+    """One bulk-import CSV row; fields dump straight onto Store columns"""
+    store_id: str = Field(..., min_length=1)
+    name: str = Field(..., min_length=1)
+    store_type: StoreType = StoreType.regular
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    address_street: str
+    address_city: str
+    address_state: str
+    address_postal_code: str
+    phone: Optional[str] = ""
+    services: List[str] = []
+    hours_mon: Optional[str] = Field("closed", validation_alias="hours_monday")
+    hours_tue: Optional[str] = Field("closed", validation_alias="hours_tuesday")
+    hours_wed: Optional[str] = Field("closed", validation_alias="hours_wednesday")
+    hours_thu: Optional[str] = Field("closed", validation_alias="hours_thursday")
+    hours_fri: Optional[str] = Field("closed", validation_alias="hours_friday")
+    hours_sat: Optional[str] = Field("closed", validation_alias="hours_saturday")
+    hours_sun: Optional[str] = Field("closed", validation_alias="hours_sunday")
+
+    @field_validator('store_type', mode='before')
+    @classmethod
+    def lowercase_store_type(cls, value):
+        return value.lower() if isinstance(value, str) else value
+
+    @field_validator('latitude', 'longitude', mode='before')
+    @classmethod
+    def empty_coordinate_is_missing(cls, value):
+        # Empty cells mean "geocode from the address"
+        return None if value == "" else value
+
+    @field_validator('services', mode='before')
+    @classmethod
+    def split_services(cls, value):
+        # Pipe-separated: "pharmacy|pickup|optical"; repeats are dropped
+        # (store_services has one row per store and service)
+        if isinstance(value, str):
+            return list(dict.fromkeys(s.strip() for s in value.split('|') if s.strip()))
+        return list(dict.fromkeys(value or []))
+
+    @property
+    def full_address(self) -> str:
+        return f"{self.address_street}, {self.address_city}, {self.address_state} {self.address_postal_code}"
+
+
 class StoreImportResult(BaseModel):
     row_number: int
     store_id: str
@@ -1,10 +1,14 @@
 import bcrypt
 
+# bcrypt work factor (2^rounds iterations); tests lower it, see tests/conftest.py
+DEFAULT_BCRYPT_ROUNDS = 12
+BCRYPT_ROUNDS = DEFAULT_BCRYPT_ROUNDS
+
 
 def get_password_hash(password: str) -> str:
     """Hash a password using bcrypt"""
     pwd_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(pwd_bytes, salt)
     return hashed.decode('utf-8')
 
@@ -2,67 +2,111 @@
 Simple in-memory cache with TTL support
 Can be replaced with Redis in production
 """
+from collections import OrderedDict
 from typing import Optional, Any
-from datetime import datetime, timedelta
 import hashlib
+import heapq
 import json
+import threading
+import time
 
 
 class SimpleCache:
-    """Thread-safe in-memory cache with TTL"""
-
-    def __init__(self):
-        self._cache = {}
+    """Thread-safe in-memory cache with TTL and LRU eviction past max_entries"""
+
+    def __init__(self, max_entries: int = 10_000):
+        # key -> (value, expires_at); expires_at is a time.monotonic() float.
+        # Ordered least to most recently used
+        self._cache = OrderedDict()
+        self.max_entries = max_entries
+        # (expires_at, key) min-heap, so expired entries are evicted from the
+        # top instead of by scanning every entry
+        self._expirations = []
+        self._lock = threading.RLock()
+        # Running eviction counts for get_stats (monotonic, e.g. for metrics export)
+        self._expired_evictions = 0
+        self._lru_evictions = 0
 
     def _generate_key(self, prefix: str, data: dict) -> str:
         """Generate a cache key from prefix and data"""
-        # Sort keys for consistent hashing
-        sorted_data = json.dumps(data, sort_keys=True)
-        hash_key = hashlib.md5(sorted_data.encode()).hexdigest()
+        # Sort keys for consistent hashing; compact separators hash fewer bytes
+        sorted_data = json.dumps(data, sort_keys=True, separators=(',', ':'))
+        # Not a security hash - BLAKE2b is faster than MD5 at the same key length
+        hash_key = hashlib.blake2b(sorted_data.encode(), digest_size=16).hexdigest()
         return f"{prefix}:{hash_key}"
 
+    def _purge(self, now: float):
+        """Evict expired entries. Caller must hold the lock."""
+        heap = self._expirations
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = self._cache.get(key)
+            # Skip heap records left behind by a later set() of the same key
+            if entry is not None and entry[1] == expires_at:
+                del self._cache[key]
+                self._expired_evictions += 1
+
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache if exists and not expired"""
-        if key not in self._cache:
-            return None
-
-        entry = self._cache[key]
-
-        # Check if expired
-        if datetime.utcnow() > entry['expires_at']:
-            del self._cache[key]
-            return None
-
-        return entry['value']
+        with self._lock:
+            self._purge(time.monotonic())
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            self._cache.move_to_end(key)
+            return entry[0]
 
     def set(self, key: str, value: Any, ttl_seconds: int):
         """Set value in cache with TTL in seconds"""
-        self._cache[key] = {
-            'value': value,
-            'expires_at': datetime.utcnow() + timedelta(seconds=ttl_seconds),
-            'created_at': datetime.utcnow()
-        }
+        now = time.monotonic()
+        expires_at = now + ttl_seconds
+        with self._lock:
+            self._purge(now)
+            self._cache[key] = (value, expires_at)
+            self._cache.move_to_end(key)
+            heapq.heappush(self._expirations, (expires_at, key))
+
+            # Evict least recently used entries past the size limit
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+                self._lru_evictions += 1
+            # Drop heap records of evicted/deleted keys so the heap stays bounded too
+            if len(self._expirations) > 2 * self.max_entries:
+                self._expirations = [(entry[1], k) for k, entry in self._cache.items()]
+                heapq.heapify(self._expirations)
 
     def delete(self, key: str):
         """Delete a key from cache"""
-        if key in self._cache:
-            del self._cache[key]
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def delete_by_prefix(self, prefix: str):
+        """Delete every key starting with prefix, e.g. "search:" """
+        with self._lock:
+            for key in [key for key in self._cache if key.startswith(prefix)]:
+                del self._cache[key]
 
     def clear(self):
         """Clear all cache entries"""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._expirations.clear()
 
     def get_stats(self) -> dict:
-        """Get cache statistics"""
-        total = len(self._cache)
-        expired = sum(1 for entry in self._cache.values()
-                     if datetime.utcnow() > entry['expires_at'])
-
-        return {
-            'total_entries': total,
-            'active_entries': total - expired,
-            'expired_entries': expired
-        }
+        """Get cache statistics - counters and lengths only, no scan of the entries"""
+        with self._lock:
+            self._purge(time.monotonic())
+            total = len(self._cache)
+            return {
+                'total_entries': total,
+                'active_entries': total,
+                # Purged above, so nothing expired is still held
+                'expired_entries': 0,
+                # Heap records for deleted or overwritten keys not yet popped
+                'pending_expirations': len(self._expirations) - total,
+                'expired_evictions': self._expired_evictions,
+                'lru_evictions': self._lru_evictions
+            }
 
 
 # Global cache instance
@@ -71,4 +115,5 @@ cache = SimpleCache()
 
 # Cache TTL constants (in seconds)
 GEOCODING_TTL = 30 * 24 * 60 * 60  # 30 days
+GEOCODING_FAILURE_TTL = 5 * 60  # 5 minutes
 SEARCH_TTL = 5 * 60  # 5 minutes
@@ -1,7 +1,9 @@
+import threading
+import time
 from geopy.geocoders import Nominatim
 from geopy.exc import GeocoderTimedOut, GeocoderServiceError
 from app.config import get_settings
-from app.utils.cache import cache, GEOCODING_TTL
+from app.utils.cache import cache, GEOCODING_TTL, GEOCODING_FAILURE_TTL
 import ssl                              # MacOS fix for SSL errors 
 import certifi                          # MacOS SSL fix
 
@@ -12,11 +14,37 @@ settings = get_settings()
 ctx = ssl.create_default_context(cafile=certifi.where())
 geolocator = Nominatim(user_agent=settings.GEOCODING_USER_AGENT, ssl_context=ctx)
 
+# Cached in place of a result when an address can't be geocoded
+_FAILED = {"__failed__": True}
+
+# Nominatim's usage policy allows at most 1 request per second. Calls from any
+# thread (bulk import geocodes from the threadpool) wait their turn here.
+GEOCODING_MIN_INTERVAL = 1.0
+_rate_limit_lock = threading.Lock()
+_next_request_at = 0.0
+
+
+def _wait_for_rate_limit():
+    """Block until GEOCODING_MIN_INTERVAL has passed since the previous API call"""
+    global _next_request_at
+    with _rate_limit_lock:
+        now = time.monotonic()
+        if now < _next_request_at:
+            time.sleep(_next_request_at - now)
+            now = _next_request_at
+        _next_request_at = now + GEOCODING_MIN_INTERVAL
+
+
+def _normalize_address(address: str) -> str:
+    """Cache key form of an address: lowercase, single-spaced"""
+    return " ".join(address.lower().split())
+
 
 def geocode_address(address: str) -> dict:
     """
     Convert an address to coordinates using Nominatim (free geocoding service).
-    Results are cached for 30 days to reduce API calls.
+    Results are cached for 30 days to reduce API calls; failed lookups are
+    cached for 5 minutes so repeated bad addresses don't hit the API either.
 
     Args:
         address: Full address string
@@ -25,12 +53,13 @@ def geocode_address(address: str) -> dict:
         dict with 'latitude' and 'longitude', or None if geocoding fails
     """
     # Check cache first
-    cache_key = f"geocode:address:{address.lower()}"
+    cache_key = f"geocode:address:{_normalize_address(address)}"
     cached_result = cache.get(cache_key)
     if cached_result is not None:
-        return cached_result
+        return None if cached_result.get("__failed__") else cached_result
 
     # Cache miss - call geocoding API
+    _wait_for_rate_limit()
     try:
         location = geolocator.geocode(address, timeout=10)
         if location:
@@ -42,10 +71,11 @@ def geocode_address(address: str) -> dict:
             # Cache the result for 30 days
             cache.set(cache_key, result, GEOCODING_TTL)
             return result
-        return None
     except (GeocoderTimedOut, GeocoderServiceError) as e:
         print(f"Geocoding error: {e}")
-        return None
+
+    cache.set(cache_key, _FAILED, GEOCODING_FAILURE_TTL)
+    return None
 
 
 def geocode_postal_code(postal_code: str, country: str = "USA") -> dict:
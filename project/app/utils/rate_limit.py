@@ -0,0 +1,27 @@
+"""
+Shared rate limiter.
+
+Counters live in Redis so every worker sees the same buckets; tests use
+in-process memory. If Redis is unreachable, slowapi falls back to memory.
+"""
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+from app.config import get_settings
+
+settings = get_settings()
+
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri="memory://" if settings.TESTING else settings.REDIS_URL,
+    in_memory_fallback_enabled=True,
+    enabled=not settings.TESTING,
+)
+
+
+if settings.TESTING:
+    def apply_rate_limit(limit_string):
+        """Testing mode: leave endpoints unwrapped (no limiter frames per call)"""
+        return lambda func: func
+else:
+    # e.g. @apply_rate_limit("10/minute;100/hour") - compound limits share one check
+    apply_rate_limit = limiter.limit
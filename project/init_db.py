@@ -3,12 +3,16 @@ Database initialization script
 Creates all tables and seeds initial data
 """
 import csv
+import io
 import os
 from sqlalchemy.orm import Session
 from app.database import engine, Base, SessionLocal
 from app.models import Store, User, Role, Permission, role_permissions, store_services
 from app.utils.auth import get_password_hash
 
+# CSV rows read and inserted per chunk when loading stores
+CSV_CHUNK_SIZE = 10_000
+
 
 def create_tables():
     """Create all database tables"""
@@ -32,14 +36,18 @@ def seed_roles_and_permissions(db: Session):
         {"name": "delete:users", "description": "Deactivate users"},
     ]
 
-    permissions = {}
-    for perm_data in permissions_data:
-        perm = db.query(Permission).filter(Permission.name == perm_data["name"]).first()
-        if not perm:
-            perm = Permission(**perm_data)
-            db.add(perm)
-            db.flush()
-        permissions[perm_data["name"]] = perm
+    # Insert the missing permissions in one executemany, then load them all
+    permission_names = [perm_data["name"] for perm_data in permissions_data]
+    existing_permissions = {
+        name for (name,) in db.query(Permission.name).filter(Permission.name.in_(permission_names))
+    }
+    db.bulk_insert_mappings(Permission, [
+        perm_data for perm_data in permissions_data if perm_data["name"] not in existing_permissions
+    ])
+    permissions = {
+        perm.name: perm
+        for perm in db.query(Permission).filter(Permission.name.in_(permission_names))
+    }
 
     # Create roles with permissions
     roles_data = [
@@ -65,16 +73,25 @@ def seed_roles_and_permissions(db: Session):
         }
     ]
 
-    roles = {}
-    for role_data in roles_data:
-        role = db.query(Role).filter(Role.name == role_data["name"]).first()
-        if not role:
-            perms = role_data.pop("permissions")
-            role = Role(**role_data)
-            role.permissions = perms
-            db.add(role)
-            db.flush()
-        roles[role_data["name"]] = role
+    # Same for roles; only newly created roles get their permissions granted
+    role_names = [role_data["name"] for role_data in roles_data]
+    existing_roles = {
+        name for (name,) in db.query(Role.name).filter(Role.name.in_(role_names))
+    }
+    new_roles = [role_data for role_data in roles_data if role_data["name"] not in existing_roles]
+    db.bulk_insert_mappings(Role, [
+        {"name": role_data["name"], "description": role_data["description"]}
+        for role_data in new_roles
+    ])
+    roles = {role.name: role for role in db.query(Role).filter(Role.name.in_(role_names))}
+
+    grants = [
+        {"role_id": roles[role_data["name"]].id, "permission_id": perm.id}
+        for role_data in new_roles
+        for perm in role_data["permissions"]
+    ]
+    if grants:
+        db.execute(role_permissions.insert(), grants)
 
     db.commit()
     print("✓ Roles and permissions created!")
@@ -106,23 +123,99 @@ def seed_users(db: Session, roles: dict):
         }
     ]
 
+    existing_emails = {
+        email for (email,) in
+        db.query(User.email).filter(User.email.in_([user_data["email"] for user_data in users_data]))
+    }
+
+    new_users = []
     for user_data in users_data:
-        existing_user = db.query(User).filter(User.email == user_data["email"]).first()
-        if not existing_user:
-            hashed_pw = get_password_hash(user_data.pop("password"))
-            role = user_data.pop("role")
-            user = User(
-                **user_data,
-                hashed_password=hashed_pw,
-                role_id=role.id
-            )
-            db.add(user)
+        if user_data["email"] not in existing_emails:
+            new_users.append({
+                "email": user_data["email"],
+                "full_name": user_data["full_name"],
+                "hashed_password": get_password_hash(user_data["password"]),
+                "role_id": user_data["role"].id
+            })
             print(f"  Created user: {user_data['email']}")
+    db.bulk_insert_mappings(User, new_users)
 
     db.commit()
     print("✓ Users created!")
 
 
+def _copy_rows(db: Session, table: str, rows: list):
+    """psycopg2 only: stream rows through COPY FROM STDIN on the session's connection"""
+    if not rows:
+        return
+    columns = list(rows[0])
+    buf = io.StringIO()
+    csv.DictWriter(buf, fieldnames=columns).writerows(rows)
+    buf.seek(0)
+    with db.connection().connection.cursor() as cur:
+        cur.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH CSV", buf)
+
+
+def _insert_store_chunk(db: Session, rows: list) -> int:
+    """Insert one chunk of CSV rows, skipping stores that already exist. Returns stores inserted."""
+    # One IN query per chunk; stores from earlier chunks are already in the
+    # transaction, so they are found here too
+    seen_ids = {
+        store_id for (store_id,) in
+        db.query(Store.store_id).filter(Store.store_id.in_([row['store_id'] for row in rows]))
+    }
+
+    store_rows = []
+    service_rows = []
+    for row in rows:
+        if row['store_id'] in seen_ids:
+            continue
+        seen_ids.add(row['store_id'])  # first row wins for repeated ids
+
+        store_rows.append({
+            'store_id': row['store_id'],
+            'name': row['name'],
+            'store_type': row['store_type'],
+            'status': row['status'],
+            'latitude': float(row['latitude']),
+            'longitude': float(row['longitude']),
+            'address_street': row['address_street'],
+            'address_city': row['address_city'],
+            'address_state': row['address_state'],
+            'address_postal_code': row['address_postal_code'],
+            'address_country': row['address_country'],
+            'phone': row['phone'],
+            'hours_mon': row['hours_mon'],
+            'hours_tue': row['hours_tue'],
+            'hours_wed': row['hours_wed'],
+            'hours_thu': row['hours_thu'],
+            'hours_fri': row['hours_fri'],
+            'hours_sat': row['hours_sat'],
+            'hours_sun': row['hours_sun']
+        })
+
+        # Parse services
+        services_list = row['services'].split('|') if row['services'] else []
+        service_rows.extend(
+            {'store_id': row['store_id'], 'service_name': service.strip()}
+            for service in services_list
+        )
+
+    # psycopg2: COPY each table in one stream (copy_expert is psycopg2 API).
+    # Other drivers get two executemany INSERTs (batched by insertmanyvalues)
+    # instead of a flush per store
+    if db.bind.dialect.driver == "psycopg2":
+        _copy_rows(db, Store.__tablename__, store_rows)
+        _copy_rows(db, store_services.name, service_rows)
+    else:
+        if store_rows:
+            db.execute(Store.__table__.insert(), store_rows)
+        if service_rows:
+            db.execute(store_services.insert(), service_rows)
+
+    return len(store_rows)
+
+
 def load_stores_from_csv(db: Session, csv_file: str):
     """Load stores from CSV file"""
     if not os.path.exists(csv_file):
@@ -131,57 +224,20 @@ def load_stores_from_csv(db: Session, csv_file: str):
 
     print(f"\nLoading stores from {csv_file}...")
 
+    # Stream the file in CSV_CHUNK_SIZE chunks so memory stays bounded
+    count = 0
     with open(csv_file, 'r') as file:
-        csv_reader = csv.DictReader(file)
-        count = 0
-
-        for row in csv_reader:
-            # Check if store already exists
-            existing_store = db.query(Store).filter(Store.store_id == row['store_id']).first()
-            if existing_store:
-                continue
-
-            # Parse services
-            services_list = row['services'].split('|') if row['services'] else []
-
-            # Create store
-            store = Store(
-                store_id=row['store_id'],
-                name=row['name'],
-                store_type=row['store_type'],
-                status=row['status'],
-                latitude=float(row['latitude']),
-                longitude=float(row['longitude']),
-                address_street=row['address_street'],
-                address_city=row['address_city'],
-                address_state=row['address_state'],
-                address_postal_code=row['address_postal_code'],
-                address_country=row['address_country'],
-                phone=row['phone'],
-                hours_mon=row['hours_mon'],
-                hours_tue=row['hours_tue'],
-                hours_wed=row['hours_wed'],
-                hours_thu=row['hours_thu'],
-                hours_fri=row['hours_fri'],
-                hours_sat=row['hours_sat'],
-                hours_sun=row['hours_sun']
-            )
-            db.add(store)
-            db.flush()
-
-            # Add services to association table
-            for service in services_list:
-                db.execute(
-                    store_services.insert().values(
-                        store_id=store.store_id,
-                        service_name=service.strip()
-                    )
-                )
-
-            count += 1
-
-        db.commit()
-        print(f"✓ Loaded {count} stores!")
+        chunk = []
+        for row in csv.DictReader(file):
+            chunk.append(row)
+            if len(chunk) == CSV_CHUNK_SIZE:
+                count += _insert_store_chunk(db, chunk)
+                chunk = []
+        if chunk:
+            count += _insert_store_chunk(db, chunk)
+
+    db.commit()
+    print(f"✓ Loaded {count} stores!")
 
 
 def main():
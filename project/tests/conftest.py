@@ -2,60 +2,110 @@
 Test configuration and fixtures
 """
 import os
+from functools import lru_cache
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
 # Set testing mode BEFORE importing app modules
 os.environ["TESTING"] = "true"
 
 from app.main import app
-from app.database import Base, get_db
+from app.database import Base, get_db, get_async_db
 from app.models import User, Role, Permission, Store, store_services
-from app.utils.auth import get_password_hash
+from app.utils import auth as auth_utils
+from app.utils import geocoding
 from app.config import get_settings
 
 # Clear settings cache and reload with TESTING=true
 get_settings.cache_clear()
 
-# Test database URL (using SQLite for testing)
-SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
+# Minimum bcrypt cost: hashes still verify the same way but take ~1ms, not ~250ms
+auth_utils.BCRYPT_ROUNDS = 4
+# Geocoder calls are faked in tests, no provider rate limit to respect
+geocoding.GEOCODING_MIN_INTERVAL = 0
+
+
+@lru_cache()
+def get_password_hash(password: str) -> str:
+    """Fixture passwords are hashed once per session, not once per test"""
+    return auth_utils.get_password_hash(password)
+
+# Test database (SQLite file). Under pytest-xdist each worker gets its own
+# file, since every test resets all rows of the database it runs against
+_xdist_worker = os.environ.get("PYTEST_XDIST_WORKER")
+TEST_DB_PATH = f"./test_{_xdist_worker}.db" if _xdist_worker else "./test.db"
+SQLALCHEMY_TEST_DATABASE_URL = f"sqlite:///{TEST_DB_PATH}"
 
 engine = create_engine(
     SQLALCHEMY_TEST_DATABASE_URL,
     connect_args={"check_same_thread": False}
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 
+# Async endpoints read the same file; NullPool so no aiosqlite connection
+# outlives the TestClient event loop it was opened on
+async_engine = create_async_engine(f"sqlite+aiosqlite:///{TEST_DB_PATH}", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database for each test"""
+
+@pytest.fixture(scope="session")
+def tables():
+    """Create the schema once per test session"""
     Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(scope="function")
+def db_session(tables):
+    """
+    Session for one test. Rows are deleted afterwards instead of dropping and
+    recreating the schema; data stays committed so the async endpoints,
+    which read through their own connection, see it too.
+    """
     db = TestingSessionLocal()
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        with engine.begin() as conn:
+            for table in reversed(Base.metadata.sorted_tables):
+                conn.execute(table.delete())
 
 
-@pytest.fixture(scope="function")
-def client(db_session):
-    """Create a test client with the test database"""
+# Session the running test's requests use; set by the client fixture
+_current_db = {}
+
+
+@pytest.fixture(scope="session")
+def app_client(tables):
+    """One TestClient (and app lifespan) shared by the whole test session"""
     def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+        yield _current_db["session"]
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def client(app_client, db_session):
+    """The shared test client, serving requests from this test's session"""
+    _current_db["session"] = db_session
+    yield app_client
+    _current_db.pop("session", None)
+
+
 @pytest.fixture(scope="function")
 def test_roles(db_session):
     """Create test roles and permissions"""
@@ -150,12 +200,10 @@ def test_store(db_session):
     db_session.add(store)
     db_session.flush()
 
-    # Add services
-    db_session.execute(
-        store_services.insert().values(store_id=store.store_id, service_name="pharmacy")
-    )
+    # Add services (one executemany)
     db_session.execute(
-        store_services.insert().values(store_id=store.store_id, service_name="pickup")
+        store_services.insert(),
+        [{"store_id": store.store_id, "service_name": name} for name in ("pharmacy", "pickup")]
     )
     db_session.commit()
 
@@ -201,3 +249,21 @@ def marketer_token(tokens):
 def viewer_token(tokens):
     """Get viewer access token"""
     return tokens["viewer"]
+
+
+@pytest.fixture(scope="function")
+def admin_headers(admin_token):
+    """Authorization header for the admin user"""
+    return {"Authorization": f"Bearer {admin_token}"}
+
+
+@pytest.fixture(scope="function")
+def marketer_headers(marketer_token):
+    """Authorization header for the marketer user"""
+    return {"Authorization": f"Bearer {marketer_token}"}
+
+
+@pytest.fixture(scope="function")
+def viewer_headers(viewer_token):
+    """Authorization header for the viewer user"""
+    return {"Authorization": f"Bearer {viewer_token}"}
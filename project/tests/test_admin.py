@@ -0,0 +1,132 @@
+"""
+API tests for admin endpoints
+"""
+import pytest
+from app.models import Store, store_services
+from app.routers import admin
+
+CSV_HEADER = (
+    "store_id,name,store_type,latitude,longitude,address_street,address_city,"
+    "address_state,address_postal_code,phone,services,hours_monday\n"
+)
+
+
+class TestBulkImport:
+    """Test CSV bulk import"""
+
+    def test_import_creates_and_updates_stores(self, client, db_session, admin_token, test_store, monkeypatch):
+        """Test upsert: new store_ids are created, existing ones updated"""
+        # Small batches so the repeated S0101 row lands in a later batch
+        monkeypatch.setattr(admin, "IMPORT_BATCH_SIZE", 2)
+        csv_body = CSV_HEADER + (
+            "S0001,Renamed Store,regular,40.7128,-74.0060,123 Test St,New York,NY,10001,,optical,09:00-17:00\n"
+            "S0100,New Store A,outlet,40.7300,-73.9900,1 A St,New York,NY,10002,,pharmacy|pickup,closed\n"
+            "S0101,New Store B,flagship,40.7400,-73.9800,2 B St,New York,NY,10003,,,closed\n"
+            "S0102,Bad Type,pop-up,40.7400,-73.9800,3 C St,New York,NY,10003,,,closed\n"
+            "S0101,New Store B2,flagship,40.7400,-73.9800,2 B St,New York,NY,10003,,,closed\n"
+        )
+
+        response = client.post(
+            "/api/admin/stores/import",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            files={"file": ("stores.csv", csv_body, "text/csv")}
+        )
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["created"] == 2
+        assert data["updated"] == 2  # S0001, and S0101 repeated
+        assert data["failed"] == 1
+        assert data["failed_records"][0]["store_id"] == "S0102"
+        assert data["failed_records"][0]["error"].startswith("Invalid store_type")
+
+        db_session.expire_all()
+        assert db_session.query(Store).filter(Store.store_id == "S0001").one().name == "Renamed Store"
+        assert db_session.query(Store).filter(Store.store_id == "S0101").one().name == "New Store B2"
+        services = db_session.execute(
+            store_services.select().where(store_services.c.store_id.in_(["S0001", "S0100"]))
+        ).fetchall()
+        assert sorted((s.store_id, s.service_name) for s in services) == [
+            ("S0001", "optical"), ("S0100", "pharmacy"), ("S0100", "pickup")
+        ]
+
+    def test_import_ignores_repeated_services(self, client, db_session, admin_token):
+        """Test a service listed twice on a row is stored once instead of failing the import"""
+        csv_body = CSV_HEADER + (
+            "S0200,Repeat Store,regular,40.7300,-73.9900,1 A St,New York,NY,10002,,pharmacy|pickup|pharmacy,closed\n"
+        )
+
+        response = client.post(
+            "/api/admin/stores/import",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            files={"file": ("stores.csv", csv_body, "text/csv")}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["created"] == 1
+        services = db_session.execute(
+            store_services.select().where(store_services.c.store_id == "S0200")
+        ).fetchall()
+        assert sorted(s.service_name for s in services) == ["pharmacy", "pickup"]
+
+    def test_import_rejects_non_utf8_file(self, client, admin_token):
+        """Test a file that isn't UTF-8 is rejected while streaming"""
+        csv_body = CSV_HEADER.encode() + "S0200,Café,regular,40.7,-74.0,1 St,NY,NY,10001,,,closed\n".encode("latin-1")
+
+        response = client.post(
+            "/api/admin/stores/import",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            files={"file": ("stores.csv", csv_body, "text/csv")}
+        )
+
+        assert response.status_code == 400
+        assert "Error reading file" in response.json()["detail"]
+
+    def test_import_geocodes_missing_coordinates(self, client, db_session, admin_token, monkeypatch):
+        """Test rows without coordinates are geocoded, each distinct address once"""
+        calls = []
+
+        def fake_geocode(address):
+            calls.append(address)
+            if address.startswith("404"):
+                return None
+            return {"latitude": 40.75, "longitude": -73.99, "formatted_address": address}
+
+        monkeypatch.setattr(admin, "geocode_address", fake_geocode)
+        csv_body = CSV_HEADER + (
+            "S0300,Geo A,regular,,,1 Geo St,New York,NY,10001,,,closed\n"
+            "S0301,Geo B,regular,,,1 Geo St,New York,NY,10001,,,closed\n"
+            "S0302,Geo C,regular,,,404 Nowhere,New York,NY,10001,,,closed\n"
+        )
+
+        response = client.post(
+            "/api/admin/stores/import",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            files={"file": ("stores.csv", csv_body, "text/csv")}
+        )
+
+        data = response.json()
+        assert data["created"] == 2
+        assert data["failed_records"][0]["store_id"] == "S0302"
+        assert sorted(calls) == ["1 Geo St, New York, NY 10001", "404 Nowhere, New York, NY 10001"]
+        assert db_session.query(Store).filter(Store.store_id == "S0301").one().latitude == 40.75
+
+    def test_import_validates_large_batches_in_worker_processes(self, client, db_session, admin_token, monkeypatch):
+        """Test the process-pool validation path gives the same result"""
+        monkeypatch.setattr(admin, "PARALLEL_VALIDATION_MIN_ROWS", 2)
+        csv_body = CSV_HEADER + (
+            "S0400,Pool A,regular,40.7300,-73.9900,1 A St,New York,NY,10002,,pickup,closed\n"
+            "S0401,Pool B,pop-up,40.7300,-73.9900,2 B St,New York,NY,10002,,,closed\n"
+            "S0402,Pool C,outlet,40.7300,-73.9900,3 C St,New York,NY,10002,,,closed\n"
+        )
+
+        response = client.post(
+            "/api/admin/stores/import",
+            headers={"Authorization": f"Bearer {admin_token}"},
+            files={"file": ("stores.csv", csv_body, "text/csv")}
+        )
+
+        data = response.json()
+        assert data["created"] == 2
+        assert [r["row_number"] for r in data["failed_records"]] == [3]
+        assert db_session.query(Store).filter(Store.store_id == "S0402").one().store_type.value == "outlet"
@@ -2,6 +2,7 @@
 API tests for authentication endpoints
 """
 import pytest
+from app.routers import auth
 
 
 class TestAuthenticationEndpoints:
@@ -39,6 +40,23 @@ class TestAuthenticationEndpoints:
 
         assert response.status_code == 401
 
+    def test_login_nonexistent_user_still_checks_password(self, client, test_users, monkeypatch):
+        """Test unknown emails still run a bcrypt check (no timing difference)"""
+        checked = []
+
+        def fake_verify(plain_password, hashed_password):
+            checked.append(hashed_password)
+            return False
+
+        monkeypatch.setattr(auth, "verify_password", fake_verify)
+        response = client.post("/api/auth/login", json={
+            "email": "nonexistent@test.com",
+            "password": "Password123!"
+        })
+
+        assert response.status_code == 401
+        assert checked == [auth._dummy_password_hash()]
+
     def test_get_current_user(self, client, admin_token):
         """Test getting current user info"""
         response = client.get(
@@ -73,3 +91,22 @@ class TestAuthenticationEndpoints:
         })
 
         assert response.status_code == 401
+
+    def test_logout_revokes_refresh_token(self, client, test_users):
+        """Test a logged-out refresh token can no longer be used"""
+        tokens = client.post("/api/auth/login", json={
+            "email": "admin@test.com",
+            "password": "AdminTest123!"
+        }).json()
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        response = client.post("/api/auth/logout", headers=headers, json={
+            "refresh_token": tokens["refresh_token"]
+        })
+        assert response.status_code == 200
+
+        response = client.post("/api/auth/refresh", json={
+            "refresh_token": tokens["refresh_token"]
+        })
+        assert response.status_code == 401
+        assert response.json()["detail"] == "Refresh token not found or has been revoked"
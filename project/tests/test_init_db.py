@@ -0,0 +1,75 @@
+"""
+Tests for the store CSV loader in init_db
+"""
+import os
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+from app.database import Base
+from app.models import Store, store_services
+from init_db import _insert_store_chunk
+
+
+def _csv_row(store_id, services="pharmacy|pickup"):
+    """One row as csv.DictReader yields it from the stores CSV"""
+    row = {
+        "store_id": store_id,
+        "name": f"Store {store_id}",
+        "store_type": "regular",
+        "status": "active",
+        "latitude": "40.7128",
+        "longitude": "-74.0060",
+        "address_street": "1 Main St",
+        "address_city": "New York",
+        "address_state": "NY",
+        "address_postal_code": "10001",
+        "address_country": "USA",
+        "phone": "212-555-0100",
+        "services": services,
+    }
+    for day in ("mon", "tue", "wed", "thu", "fri", "sat", "sun"):
+        row[f"hours_{day}"] = "09:00-21:00"
+    return row
+
+
+def _assert_chunk_loaded(db):
+    """Existing and repeated ids are skipped; services go in with their store"""
+    db.add(Store(**{k: v for k, v in _csv_row("S0001").items() if k != "services"}))
+    db.flush()
+
+    inserted = _insert_store_chunk(db, [_csv_row("S0001"), _csv_row("S0002"), _csv_row("S0002"), _csv_row("S0003", "")])
+
+    assert inserted == 2
+    assert db.query(Store).filter(Store.store_id.in_(["S0002", "S0003"])).count() == 2
+    services = db.execute(
+        store_services.select().where(store_services.c.store_id == "S0002")
+    ).all()
+    assert sorted(row.service_name for row in services) == ["pharmacy", "pickup"]
+
+
+class TestInsertStoreChunk:
+    """Test chunked store inserts"""
+
+    def test_executemany_path(self, db_session):
+        """Test the executemany fallback used by non-psycopg2 drivers"""
+        _assert_chunk_loaded(db_session)
+
+    @pytest.mark.skipif(
+        not os.environ.get("DATABASE_URL", "").startswith("postgres")
+        or make_url(os.environ["DATABASE_URL"]).get_driver_name() != "psycopg2",
+        reason="needs a PostgreSQL DATABASE_URL using psycopg2"
+    )
+    def test_copy_path(self):
+        """Test the COPY path against a real PostgreSQL database (rolled back afterwards)"""
+        pg_engine = create_engine(os.environ["DATABASE_URL"])
+        with pg_engine.connect() as conn:
+            trans = conn.begin()
+            try:
+                Base.metadata.create_all(bind=conn)
+                db = Session(bind=conn)
+                _assert_chunk_loaded(db)
+                db.close()
+            finally:
+                trans.rollback()
+        pg_engine.dispose()
@@ -2,6 +2,8 @@
 API tests for main endpoints
 """
 import pytest
+from fastapi.testclient import TestClient
+from app.main import app
 
 
 class TestMainEndpoints:
@@ -35,3 +37,16 @@ class TestMainEndpoints:
         data = response.json()
         # Cache stats should have hits, misses, size
         assert "hits" in data or "total_hits" in data or isinstance(data, dict)
+
+    def test_lifespan_shuts_down_validation_pool(self, app_client):
+        """Test the import validation pool lives and dies with the app"""
+        session_pool = app.state.validation_pool
+        try:
+            with TestClient(app):
+                pool = app.state.validation_pool
+                assert pool.submit(abs, -1).result() == 1
+
+            with pytest.raises(RuntimeError):
+                pool.submit(abs, -1)
+        finally:
+            app.state.validation_pool = session_pool
@@ -2,6 +2,11 @@
 API tests for store search endpoints
 """
 import pytest
+from app.models import Store, store_services
+from app.routers import search
+from app.routers.search import _search_cache_key
+from app.schemas import StoreSearchRequest
+from app.utils.cache import cache
 
 
 class TestStoreSearch:
@@ -61,3 +66,79 @@ class TestStoreSearch:
         data = response.json()
         assert "filters_applied" in data
         assert "pharmacy" in data["filters_applied"]["services"]
+
+    def test_search_returns_store_services(self, client, test_store):
+        """Test results carry services and the services filter excludes non-matching stores"""
+        response = client.post("/api/stores/search", json={
+            "latitude": 40.7128,
+            "longitude": -74.0060,
+            "radius_miles": 10,
+            "services": ["pharmacy"]
+        })
+        data = response.json()
+        assert data["total_results"] == 1
+        assert sorted(data["results"][0]["store"]["services"]) == ["pharmacy", "pickup"]
+
+        response = client.post("/api/stores/search", json={
+            "latitude": 40.7128,
+            "longitude": -74.0060,
+            "radius_miles": 10,
+            "services": ["optical"]
+        })
+        assert response.json()["total_results"] == 0
+
+    def test_search_excludes_bounding_box_corners(self, client, db_session, test_store):
+        """Test stores inside the bounding box but outside the radius are dropped"""
+        # ~13 miles away diagonally: inside the 9.5-mile box, outside the circle
+        db_session.add(Store(
+            store_id="S0002", name="Corner Store", store_type="regular", status="active",
+            latitude=40.7128 + 0.13, longitude=-74.0060 + 0.17,
+            address_street="1 Corner St", address_city="New York",
+            address_state="NY", address_postal_code="10002"
+        ))
+        db_session.commit()
+
+        response = client.post("/api/stores/search", json={
+            "latitude": 40.7128,
+            "longitude": -74.0060,
+            "radius_miles": 9.5
+        })
+
+        data = response.json()
+        assert [r["store"]["store_id"] for r in data["results"]] == ["S0001"]
+        assert data["results"][0]["distance_miles"] == 0
+
+    def test_search_loads_stores_in_chunks(self, client, db_session, test_store, monkeypatch):
+        """Test stores and services inside the radius are loaded chunk by chunk"""
+        monkeypatch.setattr(search, "SEARCH_ID_CHUNK_SIZE", 1)
+        db_session.add(Store(
+            store_id="S0002", name="Next Door", store_type="regular", status="active",
+            latitude=40.7138, longitude=-74.0060,
+            address_street="2 Test St", address_city="New York",
+            address_state="NY", address_postal_code="10001"
+        ))
+        db_session.flush()
+        db_session.execute(store_services.insert().values(store_id="S0002", service_name="optical"))
+        db_session.commit()
+        cache.clear()
+
+        response = client.post("/api/stores/search", json={
+            "latitude": 40.7128,
+            "longitude": -74.0060,
+            "radius_miles": 5
+        })
+
+        services = {r["store"]["store_id"]: sorted(r["store"]["services"]) for r in response.json()["results"]}
+        assert services == {"S0001": ["pharmacy", "pickup"], "S0002": ["optical"]}
+        cache.clear()
+
+    def test_search_cache_key_separates_filters(self):
+        """Test cache keys are order-insensitive and don't mix services with store types"""
+        base = {"latitude": 40.7128, "longitude": -74.0060, "radius_miles": 10}
+
+        by_service = _search_cache_key(StoreSearchRequest(**base, services=["express"]))
+        by_type = _search_cache_key(StoreSearchRequest(**base, store_types=["express"]))
+        assert by_service != by_type
+
+        assert _search_cache_key(StoreSearchRequest(**base, services=["pickup", "pharmacy"])) == \
+            _search_cache_key(StoreSearchRequest(**base, services=["pharmacy", "pickup"]))
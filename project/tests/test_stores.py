@@ -2,22 +2,26 @@
 API tests for store endpoints with RBAC
 """
 import pytest
+from app.models import Store
+from app.utils import geocoding
+from app.utils.cache import cache
 
 
 class TestStoreEndpoints:
     """Test store CRUD endpoints"""
 
-    def test_get_all_stores_with_auth(self, client, admin_token, test_store):
+    def test_get_all_stores_with_auth(self, client, admin_headers, test_store):
         """Test getting all stores with authentication"""
         response = client.get(
             "/api/stores/",
-            headers={"Authorization": f"Bearer {admin_token}"}
+            headers=admin_headers
         )
 
         assert response.status_code == 200
         data = response.json()
         assert len(data) == 1
         assert data[0]["store_id"] == "S0001"
+        assert sorted(data[0]["services"]) == ["pharmacy", "pickup"]
 
     def test_get_all_stores_without_auth(self, client, test_store):
         """Test that getting stores requires authentication"""
@@ -25,11 +29,11 @@ class TestStoreEndpoints:
 
         assert response.status_code == 403
 
-    def test_get_single_store(self, client, admin_token, test_store):
+    def test_get_single_store(self, client, admin_headers, test_store):
         """Test getting a single store"""
         response = client.get(
             "/api/stores/S0001",
-            headers={"Authorization": f"Bearer {admin_token}"}
+            headers=admin_headers
         )
 
         assert response.status_code == 200
@@ -38,16 +42,16 @@ class TestStoreEndpoints:
         assert data["name"] == "Test Store"
         assert "pharmacy" in data["services"]
 
-    def test_get_nonexistent_store(self, client, admin_token):
+    def test_get_nonexistent_store(self, client, admin_headers):
         """Test getting a non-existent store"""
         response = client.get(
             "/api/stores/S9999",
-            headers={"Authorization": f"Bearer {admin_token}"}
+            headers=admin_headers
         )
 
         assert response.status_code == 404
 
-    def test_create_store_as_marketer(self, client, marketer_token):
+    def test_create_store_as_marketer(self, client, marketer_headers):
         """Test that marketer can create stores"""
         new_store = {
             "store_id": "S0002",
@@ -67,7 +71,7 @@ class TestStoreEndpoints:
         response = client.post(
             "/api/stores/",
             json=new_store,
-            headers={"Authorization": f"Bearer {marketer_token}"}
+            headers=marketer_headers
         )
 
         assert response.status_code == 201
@@ -75,33 +79,65 @@ class TestStoreEndpoints:
         assert data["store_id"] == "S0002"
         assert data["name"] == "New Test Store"
 
-    def test_create_store_as_viewer_forbidden(self, client, viewer_token):
-        """Test that viewer cannot create stores"""
+    def test_create_store_duplicate_id(self, client, marketer_headers, test_store):
+        """Test that an existing store_id is rejected"""
         new_store = {
-            "store_id": "S0003",
-            "name": "Forbidden Store",
+            "store_id": "S0001",
+            "name": "Duplicate Store",
             "store_type": "regular",
-            "status": "active",
             "latitude": 40.7580,
             "longitude": -73.9855,
-            "address_street": "789 Forbidden St",
+            "address_street": "1 Duplicate St",
             "address_city": "New York",
             "address_state": "NY",
-            "address_postal_code": "10003",
-            "phone": "212-555-9999",
+            "address_postal_code": "10002",
             "services": []
         }
 
         response = client.post(
             "/api/stores/",
             json=new_store,
-            headers={"Authorization": f"Bearer {viewer_token}"}
+            headers=marketer_headers
         )
 
-        assert response.status_code == 403
-        assert "Permission denied" in response.json()["detail"]
-
-    def test_update_store_partial(self, client, marketer_token, test_store):
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Store ID already exists"
+
+    def test_create_store_geocodes_once_per_address(self, client, marketer_headers, monkeypatch):
+        """Test stores created without coordinates reuse the cached geocode"""
+        calls = []
+
+        class Location:
+            latitude, longitude, address = 40.7580, -73.9855, "New York, NY"
+
+        def fake_geocode(address, timeout):
+            calls.append(address)
+            return Location()
+
+        cache.clear()
+        monkeypatch.setattr(geocoding.geolocator, "geocode", fake_geocode)
+
+        for store_id in ("S0010", "S0011"):
+            response = client.post(
+                "/api/stores/",
+                json={
+                    "store_id": store_id,
+                    "name": "Geocoded Store",
+                    "store_type": "regular",
+                    "address_street": "1 Geo St",
+                    "address_city": "New York",
+                    "address_state": "NY",
+                    "address_postal_code": "10002",
+                },
+                headers=marketer_headers
+            )
+            assert response.status_code == 201
+            assert response.json()["latitude"] == 40.7580
+
+        assert calls == ["1 Geo St, New York, NY 10002"]
+        cache.clear()
+
+    def test_update_store_partial(self, client, marketer_headers, test_store):
         """Test partial update (PATCH) of store"""
         update_data = {
             "name": "Updated Store Name",
@@ -111,7 +147,7 @@ class TestStoreEndpoints:
         response = client.patch(
             "/api/stores/S0001",
             json=update_data,
-            headers={"Authorization": f"Bearer {marketer_token}"}
+            headers=marketer_headers
         )
 
         assert response.status_code == 200
@@ -121,106 +157,99 @@ class TestStoreEndpoints:
         # Other fields should remain unchanged
         assert data["address_city"] == "New York"
 
-    def test_update_store_as_viewer_forbidden(self, client, viewer_token, test_store):
-        """Test that viewer cannot update stores"""
-        response = client.patch(
-            "/api/stores/S0001",
-            json={"name": "Should Not Update"},
-            headers={"Authorization": f"Bearer {viewer_token}"}
-        )
-
-        assert response.status_code == 403
-
-    def test_update_nonexistent_store(self, client, marketer_token):
+    def test_update_nonexistent_store(self, client, marketer_headers):
         """Test updating a non-existent store returns 404"""
         response = client.patch(
             "/api/stores/S9999",
             json={"name": "Does Not Exist"},
-            headers={"Authorization": f"Bearer {marketer_token}"}
+            headers=marketer_headers
         )
 
         assert response.status_code == 404
 
-    def test_delete_store_soft_delete(self, client, marketer_token, test_store):
+    def test_delete_store_soft_delete(self, client, marketer_headers, test_store):
         """Test soft delete of store"""
         response = client.delete(
             "/api/stores/S0001",
-            headers={"Authorization": f"Bearer {marketer_token}"}
+            headers=marketer_headers
         )
 
         assert response.status_code == 204
 
-    def test_delete_store_as_viewer_forbidden(self, client, viewer_token, test_store):
-        """Test that viewer cannot delete stores"""
-        response = client.delete(
-            "/api/stores/S0001",
-            headers={"Authorization": f"Bearer {viewer_token}"}
-        )
+    @pytest.mark.parametrize("method, path, body", [
+        pytest.param("post", "/api/stores/", {
+            "store_id": "S0003",
+            "name": "Forbidden Store",
+            "store_type": "regular",
+            "status": "active",
+            "latitude": 40.7580,
+            "longitude": -73.9855,
+            "address_street": "789 Forbidden St",
+            "address_city": "New York",
+            "address_state": "NY",
+            "address_postal_code": "10003",
+            "phone": "212-555-9999",
+            "services": []
+        }, id="create"),
+        pytest.param("patch", "/api/stores/S0001", {"name": "Should Not Update"}, id="update"),
+        pytest.param("delete", "/api/stores/S0001", None, id="delete"),
+    ])
+    def test_write_as_viewer_forbidden(self, client, viewer_headers, test_store, method, path, body):
+        """Test that viewer cannot create, update or delete stores"""
+        kwargs = {"json": body} if body is not None else {}
+        response = getattr(client, method)(path, headers=viewer_headers, **kwargs)
 
         assert response.status_code == 403
+        assert "Permission denied" in response.json()["detail"]
+
+
+@pytest.fixture(scope="module")
+def store_payload():
+    """Create-store body shared by the RBAC tests"""
+    return {
+        "store_id": "S9999",
+        "name": "RBAC Store",
+        "store_type": "regular",
+        "status": "active",
+        "latitude": 40.7128,
+        "longitude": -74.0060,
+        "address_street": "100 RBAC St",
+        "address_city": "New York",
+        "address_state": "NY",
+        "address_postal_code": "10001",
+        "phone": "212-555-1111",
+        "services": []
+    }
 
 
 class TestRBACPermissions:
     """Test Role-Based Access Control"""
 
-    def test_admin_has_all_permissions(self, client, admin_token, test_store):
-        """Test that admin can perform all operations"""
+    @pytest.mark.parametrize("role, create_status", [
+        pytest.param("admin", 201, id="admin"),
+        pytest.param("marketer", 201, id="marketer"),
+        pytest.param("viewer", 403, id="viewer"),
+    ])
+    def test_role_can_read_and_create(self, client, tokens, test_store, store_payload, role, create_status):
+        """Test every role can read stores and only write roles can create them"""
+        headers = {"Authorization": f"Bearer {tokens[role]}"}
+
         # Read
-        response = client.get(
-            "/api/stores/",
-            headers={"Authorization": f"Bearer {admin_token}"}
-        )
+        response = client.get("/api/stores/", headers=headers)
         assert response.status_code == 200
 
         # Create
-        new_store = {
-            "store_id": "S9999",
-            "name": "Admin Store",
-            "store_type": "flagship",
-            "status": "active",
-            "latitude": 40.7128,
-            "longitude": -74.0060,
-            "address_street": "100 Admin St",
-            "address_city": "New York",
-            "address_state": "NY",
-            "address_postal_code": "10001",
-            "phone": "212-555-1111",
-            "services": []
-        }
-        response = client.post(
-            "/api/stores/",
-            json=new_store,
-            headers={"Authorization": f"Bearer {admin_token}"}
-        )
-        assert response.status_code == 201
+        response = client.post("/api/stores/", json=store_payload, headers=headers)
+        assert response.status_code == create_status
 
-    def test_viewer_can_only_read(self, client, viewer_token, test_store):
-        """Test that viewer can only read, not write or delete"""
-        # Read - should work
-        response = client.get(
-            "/api/stores/",
-            headers={"Authorization": f"Bearer {viewer_token}"}
-        )
-        assert response.status_code == 200
 
-        # Create - should fail
-        new_store = {
-            "store_id": "S8888",
-            "name": "Viewer Store",
-            "store_type": "regular",
-            "status": "active",
-            "latitude": 40.7128,
-            "longitude": -74.0060,
-            "address_street": "200 Viewer St",
-            "address_city": "New York",
-            "address_state": "NY",
-            "address_postal_code": "10001",
-            "phone": "212-555-2222",
-            "services": []
-        }
-        response = client.post(
-            "/api/stores/",
-            json=new_store,
-            headers={"Authorization": f"Bearer {viewer_token}"}
-        )
-        assert response.status_code == 403
+class TestStoreModel:
+    """Test Store model behavior"""
+
+    def test_hours_are_interned_on_load(self, db_session, test_store):
+        """Test loaded hours strings are shared objects and the store stays clean"""
+        db_session.expunge_all()
+        store = db_session.query(Store).filter(Store.store_id == "S0001").one()
+
+        assert store.hours_mon is store.hours_tue
+        assert store not in db_session.dirty
@@ -2,9 +2,16 @@
 Unit tests for utility functions
 """
 import pytest
-from app.utils.distance import calculate_bounding_box, calculate_distance, is_store_open_now
+import numpy as np
+from app.utils.distance import calculate_bounding_box, calculate_distance, haversine_miles, is_store_open_now, parse_hours, pack_weekly_hours, is_open_at
+from app.utils import auth as auth_module
 from app.utils.auth import get_password_hash, verify_password
+from app.utils import geocoding
+from app.utils import cache as cache_module
+from app.utils.cache import cache, SimpleCache
+from geopy.exc import GeocoderTimedOut
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 
 class TestDistanceUtils:
@@ -38,35 +45,222 @@ class TestDistanceUtils:
         distance = calculate_distance(40.7128, -74.0060, 40.7128, -74.0060)
         assert distance < 0.01  # Essentially zero
 
+    def test_haversine_miles_vectorized(self):
+        """Test vectorized distances agree with the scalar calculation"""
+        lats = np.array([40.7128, 39.9526])
+        lons = np.array([-74.0060, -75.1652])
 
+        distances = haversine_miles(40.7128, -74.0060, lats, lons)
+
+        assert distances.shape == (2,)
+        assert distances[0] < 0.01
+        # Haversine (sphere) vs geodesic (ellipsoid) differ by well under 1%
+        assert abs(distances[1] - calculate_distance(40.7128, -74.0060, 39.9526, -75.1652)) < 0.5
+
+    def test_haversine_miles_store_matrix(self):
+        """Test one vectorized call over 1000 stores matches the per-store calculation"""
+        rng = np.random.default_rng(0)
+        lats = rng.uniform(38.0, 43.0, 1000)
+        lons = rng.uniform(-78.0, -71.0, 1000)
+
+        distances = haversine_miles(40.7128, -74.0060, lats, lons)
+
+        expected = np.array([calculate_distance(40.7128, -74.0060, lat, lon) for lat, lon in zip(lats, lons)])
+        assert distances.shape == (1000,)
+        # Sphere vs ellipsoid: within 0.5% (plus a small absolute slack near zero)
+        assert np.allclose(distances, expected, rtol=0.005, atol=0.05)
+
+
+class TestStoreHoursUtils:
+    """Test store hours utilities"""
+
+    def test_parse_hours(self):
+        """Test hours strings parse to minute-of-day windows"""
+        assert parse_hours("09:00-21:30") == (540, 1290)
+        assert parse_hours("closed") is None
+        assert parse_hours("not hours") is None
+
+    def test_is_store_open_now(self):
+        """Test open check against a fixed time"""
+        hours = {"hours_mon": "09:00-21:00", "hours_sun": "closed"}
+        monday = datetime(2025, 11, 17)
+
+        assert is_store_open_now(hours, monday.replace(hour=12)) is True
+        assert is_store_open_now(hours, monday.replace(hour=22)) is False
+        assert is_store_open_now(hours, datetime(2025, 11, 16, 12)) is False  # Sunday
+        assert is_store_open_now(hours, datetime(2025, 11, 18, 12)) is False  # Tuesday missing
+
+    def test_pack_weekly_hours(self):
+        """Test packed open windows index by weekday"""
+        windows = pack_weekly_hours("09:00-21:00", "closed", "closed", "closed", "closed", "closed", "10:00-18:00")
+
+        assert windows[0] == (540, 1260)
+        assert windows[1] is None
+        assert is_open_at(windows, datetime(2025, 11, 16, 12)) is True  # Sunday
+        assert is_open_at(windows, datetime(2025, 11, 18, 12)) is False  # Tuesday
+
+
+class TestGeocodingUtils:
+    """Test geocoding cache behavior"""
+
+    def test_geocode_result_is_cached(self, monkeypatch):
+        """Test equivalent addresses share one cached lookup"""
+        calls = []
+
+        class Location:
+            latitude, longitude, address = 40.7128, -74.0060, "New York, NY"
+
+        def fake_geocode(address, timeout):
+            calls.append(address)
+            return Location()
+
+        cache.clear()
+        monkeypatch.setattr(geocoding.geolocator, "geocode", fake_geocode)
+
+        assert geocoding.geocode_address("1 Main St,  New York")["latitude"] == 40.7128
+        assert geocoding.geocode_address("1 main st, new york")["latitude"] == 40.7128
+        assert len(calls) == 1
+
+    def test_geocode_failure_is_cached(self, monkeypatch):
+        """Test a failed lookup is not retried while negatively cached"""
+        calls = []
+
+        def failing_geocode(address, timeout):
+            calls.append(address)
+            raise GeocoderTimedOut("timed out")
+
+        cache.clear()
+        monkeypatch.setattr(geocoding.geolocator, "geocode", failing_geocode)
+
+        assert geocoding.geocode_address("nowhere") is None
+        assert geocoding.geocode_address("nowhere") is None
+        assert len(calls) == 1
+
+    def test_geocode_calls_are_rate_limited(self, monkeypatch):
+        """Test uncached lookups are spaced GEOCODING_MIN_INTERVAL apart, even across threads"""
+        now = [1000.0]
+        call_times = []
+
+        class Location:
+            latitude, longitude, address = 40.7128, -74.0060, "New York, NY"
+
+        def fake_geocode(address, timeout):
+            call_times.append(now[0])
+            return Location()
+
+        def fake_sleep(seconds):
+            now[0] += seconds
+
+        cache.clear()
+        monkeypatch.setattr(geocoding, "GEOCODING_MIN_INTERVAL", 1.0)
+        monkeypatch.setattr(geocoding, "_next_request_at", 0.0)
+        monkeypatch.setattr(geocoding.time, "monotonic", lambda: now[0])
+        monkeypatch.setattr(geocoding.time, "sleep", fake_sleep)
+        monkeypatch.setattr(geocoding.geolocator, "geocode", fake_geocode)
+
+        for address in ["1 Main St", "2 Main St", "3 Main St"]:
+            geocoding.geocode_address(address)
+
+        assert len(call_times) == 3
+        assert all(later - earlier >= 1.0 for earlier, later in zip(call_times, call_times[1:]))
+
+        # Concurrent callers queue on the same limiter: 4 more calls need 4 more seconds
+        start = now[0]
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(geocoding.geocode_address, ["4 Main St", "5 Main St", "6 Main St", "7 Main St"]))
+
+        assert len(call_times) == 7
+        assert now[0] - start >= 4.0
+        cache.clear()
+
+
+class TestCacheUtils:
+    """Test the in-memory cache"""
+
+    def test_delete_by_prefix_keeps_other_entries(self):
+        """Test search invalidation leaves geocoding entries in place"""
+        cache.clear()
+        cache.set("search:40.7128:-74.0060:10::", {"stores": []}, 60)
+        cache.set("geocode:address:1 main st", {"latitude": 40.7128}, 60)
+
+        cache.delete_by_prefix("search:")
+
+        assert cache.get("search:40.7128:-74.0060:10::") is None
+        assert cache.get("geocode:address:1 main st") == {"latitude": 40.7128}
+        cache.clear()
+
+    def test_least_recently_used_entry_is_evicted(self):
+        """Test the cache stays within max_entries, keeping recently read keys"""
+        small_cache = SimpleCache(max_entries=2)
+        small_cache.set("a", 1, 60)
+        small_cache.set("b", 2, 60)
+        small_cache.get("a")
+        small_cache.set("c", 3, 60)
+
+        assert small_cache.get("b") is None
+        assert small_cache.get("a") == 1
+        assert small_cache.get("c") == 3
+        assert small_cache.get_stats()["lru_evictions"] == 1
+
+    def test_expired_entries_are_evicted(self, monkeypatch):
+        """Test expired keys are dropped and a refreshed key is kept"""
+        now = [1000.0]
+        monkeypatch.setattr(cache_module.time, "monotonic", lambda: now[0])
+        cache.clear()
+        cache.set("search:old", 1, 10)
+        cache.set("search:refreshed", 2, 10)
+        cache.set("search:refreshed", 3, 60)
+
+        now[0] += 30
+
+        assert cache.get("search:old") is None
+        assert cache.get("search:refreshed") == 3
+        stats = cache.get_stats()
+        assert stats["total_entries"] == 1
+        assert stats["expired_evictions"] >= 1
+        cache.clear()
+
+
+PASSWORD = "TestPassword123!"
+
+
+@pytest.fixture(scope="module")
+def production_bcrypt_rounds():
+    """Hash at the real cost factor (conftest lowers it for the rest of the suite)"""
+    test_rounds = auth_module.BCRYPT_ROUNDS
+    auth_module.BCRYPT_ROUNDS = auth_module.DEFAULT_BCRYPT_ROUNDS
+    yield
+    auth_module.BCRYPT_ROUNDS = test_rounds
+
+
+@pytest.fixture(scope="module")
+def password_hash(production_bcrypt_rounds):
+    """One bcrypt hash of PASSWORD shared by the auth utility tests"""
+    return get_password_hash(PASSWORD)
+
+
+@pytest.mark.slow
+@pytest.mark.usefixtures("production_bcrypt_rounds")
 class TestAuthUtils:
     """Test authentication utilities"""
 
-    def test_password_hashing(self):
+    def test_password_hashing(self, password_hash):
         """Test password hashing"""
-        password = "TestPassword123!"
-        hashed = get_password_hash(password)
-
         # Hash should be different from original
-        assert hashed != password
+        assert password_hash != PASSWORD
 
         # Should be able to verify
-        assert verify_password(password, hashed) is True
+        assert verify_password(PASSWORD, password_hash) is True
 
-    def test_password_verification_fails(self):
+    def test_password_verification_fails(self, password_hash):
         """Test wrong password fails verification"""
-        password = "TestPassword123!"
-        hashed = get_password_hash(password)
-
-        assert verify_password("WrongPassword", hashed) is False
+        assert verify_password("WrongPassword", password_hash) is False
 
-    def test_different_hashes_for_same_password(self):
+    def test_different_hashes_for_same_password(self, password_hash):
         """Test that same password produces different hashes (due to salt)"""
-        password = "TestPassword123!"
-        hash1 = get_password_hash(password)
-        hash2 = get_password_hash(password)
+        new_hash = get_password_hash(PASSWORD)
 
-        assert hash1 != hash2
+        assert new_hash != password_hash
         # But both should verify
-        assert verify_password(password, hash1) is True
-        assert verify_password(password, hash2) is True
+        assert verify_password(PASSWORD, password_hash) is True
+        assert verify_password(PASSWORD, new_hash) is True
@@ -1,32 +1,73 @@
 # Design Patterns
+import atexit
+import sys
+import threading
 
 # 1. Singleton pattern
 # database_instance = Database()
 
-class Logger:
-    # def __init__
-    _instance = None
-    
-    def __new__(cls):
-        if(cls._instance is None):
-            cls._instance = super().__new__(cls)
-            cls._instance.logs = []
+class SingletonMeta(type):
+    # metaclass: Logger() calls this __call__, so the instance is created once
+    _instances = {}
+    _lock = threading.Lock()
+
+    def __call__(cls, *args, **kwargs):
+        # fast path: already created, no lock
+        instance = cls._instances.get(cls)
+        if instance is not None:
+            return instance
+        # slow path: lock, then check again (another thread may have won)
+        with cls._lock:
+            if cls not in cls._instances:
+                cls._instances[cls] = super().__call__(*args, **kwargs)
+            return cls._instances[cls]
+
 
-        return cls._instance
+class Logger(metaclass=SingletonMeta):
+    BATCH = 64  # lines written to stdout per write() call
+
+    def __init__(self):
+        # runs only once
+        self.logs = []
+        self.buf = []
+        atexit.register(self.flush)  # don't lose buffered lines on exit
     
     def log(self, message):
         self.logs.append(message)
-        print(f"log: {message}")
-    
-    
+        # buffer instead of one print (one syscall) per message.
+        # Buffered lines are written only when BATCH lines are waiting, on an
+        # explicit flush(), or at exit - print() elsewhere goes out right away,
+        # so call flush() before printing anything that should come after them
+        self.buf.append(f"log: {message}")
+        if len(self.buf) >= self.BATCH:
+            self.flush()
 
-logger1 = Logger()
-# logger2 = Logger()
+    def flush(self):
+        if self.buf:
+            sys.stdout.write("\n".join(self.buf) + "\n")
+            self.buf.clear()
 
 
 # 2. Factory pattern
 # create objects without giving exact class to create
 
+class AnimalFactory:
+    # type name -> class; a dict lookup instead of an if/elif per type,
+    # and new animals register themselves without editing the factory
+    _registry = {}
+
+    @classmethod
+    def register(cls, type):
+        def decorator(animal_cls):
+            cls._registry[type] = animal_cls
+            return animal_cls
+        return decorator
+
+    @classmethod
+    def create_animal(cls, type, *args, **kwargs):
+        return cls._registry[type](*args, **kwargs)
+
+
 class Animal:
     def __init__(self, name):
         self.name = name
@@ -37,6 +78,7 @@ class Animal:
     def eat(self, food):
         print(f"{self.name} is eating {food}")
 
+@AnimalFactory.register('dog')
 class Dog(Animal):
     
     def __init__(self, name, type):
@@ -48,21 +90,11 @@ class Dog(Animal):
         #  super().speak() call parent method
         print(f"{self.name} of {self.type} make a woof!")
         
+@AnimalFactory.register('cat')
 class Cat(Animal):
     def speak(self):
         print(f"{self.name} make a meow!")
 
-class AnimalFactory:
-    def create_animal(type):
-        if type == 'cat':
-            return Cat()
-        elif type == 'dog':
-            return Dog()
-        #...
-
-AnimalFactory.create_animal('cat')
-AnimalFactory.create_animal('dog')
-
 
 # 3 Observer Pattern
 # Define one-to-many system for notifying the multiple clients of new changes
@@ -71,19 +103,30 @@ AnimalFactory.create_animal('dog')
 class Newletter:
     def __init__(self, system_name):
         self.system_name = system_name
-        self.subscribers = []
+        # email -> callback: O(1) subscribe/unsubscribe, one entry per email
+        self.subscribers = {}
         
     def subscribe(self, email, callback_func):
-        self.subscribers.append((email, callback_func))
+        self.subscribers[email] = callback_func
         print(f"{email} subscribed to {self.system_name}")
         
     def unscubscribe(self, email):
-        self.subscribers.remove(email)
+        self.subscribers.pop(email, None)
     
     def publish_news(self, news):
-        for email, callback_func in self.subscribers:
-            # process code to send email
-            print(f'Sending email to {email}: {news}')
+        # process code to send email - all lines in one write
+        sys.stdout.write("".join(f'Sending email to {email}: {news}\n' for email in self.subscribers))
+        for callback_func in self.subscribers.values():
             callback_func(news)
-            
-            
+
+
+# demo - only when run as a script, so importing this module has no side effects
+if __name__ == "__main__":
+    logger1 = Logger()
+    # logger2 = Logger()
+    logger1.log('app started')
+    logger1.log('config loaded')
+    logger1.flush()  # write the buffered lines now, before the prints below
+
+    AnimalFactory.create_animal('cat', 'Kitty').speak()
+    AnimalFactory.create_animal('dog', 'Buddy', 'husky').speak()
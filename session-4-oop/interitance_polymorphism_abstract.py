@@ -1,4 +1,10 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import cached_property
+import math
+import numpy as np
+
+_PI = math.pi
 # Inheritance
 # allow a class to acquire properties and methods from another class
 
@@ -27,16 +33,6 @@ class Cat(Animal):
     def speak(self):
         print(f"{self.name} make a meow!")
 
-dog_1 = Dog('Max', 'Golden doodle')
-
-print(dog_1.name)
-dog_1.eat('bone')
-dog_1.speak()
-
-cat_1 = Cat('Sophie')
-cat_1.speak()
-cat_1.eat('fish')
-
 
 class A:
     def greet(self):
@@ -54,10 +50,6 @@ class B:
 class C(A, B):
     pass
 
-c = C()
-c.greet()
-c.run()
-
 
 ## Polymorphism & abstract
 # same method, different implementation in different class
@@ -68,10 +60,10 @@ class BadCircle:
         self.radius = radius
     
     def circle_area(self):
-        return 3.14 * self.radius**2
+        return _PI * self.radius * self.radius
 
     def circle_perimeter(self):
-        return 2 * 3.13 * self.radius
+        return 2.0 * _PI * self.radius
 
 class BadRetangle:
     def __init__(self, width, height):
@@ -90,46 +82,105 @@ class BadRetangle:
 # inherite Abstract Base Class
 class Shape(ABC):
     
+    @property
     @abstractmethod
     def area(self):
         pass
     
+    @property
     @abstractmethod
     def perimeter(self):
         pass
 
 # shape_1 = Shape() raise error!
     
+# shapes don't change after creation, so area/perimeter are computed on
+# first access and then cached on the instance (cached_property)
 class Retangle(Shape):
     def __init__(self, width, height):
         self.width = width
         self.height = height
     
+    @cached_property
     def area(self):
         return self.width * self.height
 
+    @cached_property
     def perimeter(self):
-        return 2* (self.width + self.height)
+        return 2 * (self.width + self.height)
     
 class Circle(Shape):
     def __init__(self, radius):
         self.radius = radius
     
+    @cached_property
     def area(self):
-        return 3.14 * self.radius**2
+        return _PI * self.radius * self.radius
 
+    @cached_property
     def perimeter(self):
-        return 2 * 3.13 * self.radius
-    
-# retangle = BadRetangle(1,1)
-# circle = BadCircle(2)
+        return 2.0 * _PI * self.radius
+
+
+## Struct of arrays
+# the shapes loop (see demo below) does one attribute lookup + one Python call per shape.
+# For millions of shapes, store each field as a NumPy column instead and
+# compute every area in one vectorized pass per shape type.
+
+RECT, CIRCLE = 0, 1
+
+@dataclass
+class ShapeBatch:
+    kinds: np.ndarray   # RECT or CIRCLE per shape
+    widths: np.ndarray  # rectangles only (0 for circles)
+    heights: np.ndarray
+    radii: np.ndarray   # circles only (0 for rectangles)
+
+    @classmethod
+    def from_list(cls, shapes):
+        is_circle = [isinstance(shape, Circle) for shape in shapes]
+        return cls(
+            kinds=np.where(is_circle, CIRCLE, RECT),
+            widths=np.array([0.0 if c else shape.width for shape, c in zip(shapes, is_circle)]),
+            heights=np.array([0.0 if c else shape.height for shape, c in zip(shapes, is_circle)]),
+            radii=np.array([shape.radius if c else 0.0 for shape, c in zip(shapes, is_circle)]),
+        )
+
+    def areas(self):
+        return np.where(self.kinds == CIRCLE, _PI * self.radii ** 2, self.widths * self.heights)
+
+    def perimeters(self):
+        return np.where(self.kinds == CIRCLE, 2.0 * _PI * self.radii, 2 * (self.widths + self.heights))
+
+
+# demo - only when run as a script, so importing this module has no side effects
+if __name__ == "__main__":
+    dog_1 = Dog('Max', 'Golden doodle')
+
+    print(dog_1.name)
+    dog_1.eat('bone')
+    dog_1.speak()
+
+    cat_1 = Cat('Sophie')
+    cat_1.speak()
+    cat_1.eat('fish')
+
+    c = C()
+    c.greet()
+    c.run()
+
+    # retangle = BadRetangle(1,1)
+    # circle = BadCircle(2)
+
+    retangle = Retangle(1,1)
+    circle = Circle(2)
 
-retangle = Retangle(1,1)
-circle = Circle(2)
+    shapes = [retangle, circle]
 
-shapes = [retangle, circle]
+    for shape in shapes:
+        print(shape.area)
+        print(shape.perimeter)
 
-for shape in shapes:
-    print(shape.area())
-    print(shape.perimeter())
-    
\ No newline at end of file
+    batch = ShapeBatch.from_list(shapes)
+    print(batch.areas())
+    print(batch.perimeters())
@@ -1,14 +1,19 @@
 # decorator
 # reuse the logic / functions to functions
 import time
+from functools import wraps
 
 def log_performance(level="INFO"):
     def decorator(func):
+        name = func.__name__  # read once per decoration, not per call
+
+        @wraps(func)  # keep func's __name__ / __doc__ on the wrapper
         def wrapper(*args, **kwargs):
-            start = time.time()
+            # perf_counter_ns: monotonic, ns resolution (time.time can jump and is coarse)
+            start = time.perf_counter_ns()
             result = func(*args, **kwargs)
-            end = time.time()
-            print(f'[{level}] {func.__name__} is taking {end - start:.4f} seconds')
+            elapsed = (time.perf_counter_ns() - start) / 1e9
+            print(f'[{level}] {name} is taking {elapsed:.6f} seconds')
             return result
 
         return wrapper
@@ -28,9 +33,10 @@ def fun1():
     # log_performance_func()
     # log the performance code
     print('func1')
-    n = 0
-    for i in range(100000):
-      n +=1    
+    # adding 1 a hundred thousand times is just 100_000: compute loops like
+    # this in closed form instead of running them
+    n = 100_000
+    time.sleep(0.01)  # simulated work for log_performance to time
 
 def fun2():
     # log_performance_func()
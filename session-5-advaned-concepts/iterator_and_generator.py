@@ -17,19 +17,7 @@ special iterator
  
 
 '''
-
-my_list = [1, 2, 3]
-iterator = iter(my_list)
-print(next(iterator))
-print(next(iterator))
-print(next(iterator))
-# print(next(iterator)) # raise StopIteration error
-
-print(type(my_list))
-print(type(iter(my_list)))
-
-for x in my_list:
-    print(x)
+import numpy as np
 
 '''
 What for loops do behind the scene
@@ -48,9 +36,9 @@ While True:
 
 
 class Counter:
-    def __init__(self):
+    def __init__(self, max=5):
         self.current = 0
-        self.max = 5
+        self.max = max
 
     def __iter__(self):
         return self
@@ -63,10 +51,17 @@ class Counter:
         raise StopIteration
 
 
-c = Counter()
+# Same sequence as a generator: range's iterator steps in C, so each next()
+# skips the attribute loads/stores Counter.__next__ does in Python.
+# When all you need is counting, prefer range itself.
+def counter(n):
+    yield from range(1, n + 1)
 
-for i in c:
-    print(f'my counter: {i}')
+'''
+python -m timeit -s "from iterator_and_generator import Counter" "list(Counter(1_000_000))"
+python -m timeit -s "from iterator_and_generator import counter" "list(counter(1_000_000))"
+the range-based generator is roughly twice as fast
+'''
 
 
 # generator
@@ -79,27 +74,73 @@ def fibonacci(limit):
         a, b = b, a + b
 
 
+# fibonacci() is the API for streaming every value up to a limit.
+# To get just the n-th number, fast doubling takes O(log n) multiplications
+# instead of n additions:
+#   F(2k) = F(k) * (2*F(k+1) - F(k)),  F(2k+1) = F(k)^2 + F(k+1)^2
+def fib_nth(n):
+    def pair(k):  # (F(k), F(k+1))
+        if k == 0:
+            return (0, 1)
+        a, b = pair(k >> 1)
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        return (d, c + d) if k & 1 else (c, d)
+
+    return pair(n)[0]
+
+
 def my_generator():
     yield 'first'
     yield 'second'
     yield 'third'
 
 
-generator = my_generator()
-print(next(generator))
-print(next(generator))
-print(next(generator))
+# demo - only when run as a script, so importing this module has no side effects
+if __name__ == "__main__":
+    my_list = [1, 2, 3]
+    iterator = iter(my_list)
+    print(next(iterator))
+    print(next(iterator))
+    print(next(iterator))
+    # print(next(iterator)) # raise StopIteration error
+
+    print(type(my_list))
+    print(type(iter(my_list)))
+
+    for x in my_list:
+        print(x)
+
+    c = Counter()
+
+    for i in c:
+        print(f'my counter: {i}')
+
+    for i in counter(5):
+        print(f'my counter: {i}')
+
+    generator = my_generator()
+    print(next(generator))
+    print(next(generator))
+    print(next(generator))
 
-f = fibonacci(5)
-print(next(f))
-print(next(f))
-print(next(f))
-print(next(f))
-# print(next(generator))
+    f = fibonacci(5)
+    print(next(f))
+    print(next(f))
+    print(next(f))
+    print(next(f))
+    # print(next(generator))
 
-# generator comprehension expression
+    print(fib_nth(10))  # 55
 
-numbers = [1, 2, 3, 4, 5]
-squares = (x ** 2 for x in numbers)
+    # generator comprehension expression
 
+    numbers = [1, 2, 3, 4, 5]
+    squares = (x ** 2 for x in numbers)
+    print(list(squares))
 
+    # numeric data that fits in memory: NumPy squares every element in C
+    # (vectorized) instead of one Python ** per element.
+    # The generator is still the choice when the input is lazy, infinite or mixed types
+    squares_fast = np.square(np.asarray(numbers))
+    print(squares_fast)